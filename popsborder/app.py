@@ -62,8 +62,22 @@ def get_executable_name():
         return f"python -m {name}"
 
 
-def main():
-    """Process command line parameters and run the simulation"""
+def positive_integer(text):
+    """Convert text to a positive integer for use as an argparse type"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, not {value}")
+    return value
+
+
+def main(args=None):
+    """Process command line parameters and run the simulation
+
+    :param args: List of command line arguments (``sys.argv`` is used if None)
+    """
     parser = argparse.ArgumentParser(
         description="Pathway simulation of contaminated consignments",
         formatter_class=CustomHelpFormatter,
@@ -88,6 +102,13 @@ def main():
     optional.add_argument(
         "--seed", type=int, required=False, help="Seed for random generator"
     )
+    optional.add_argument(
+        "--processes",
+        type=positive_integer,
+        required=False,
+        default=1,
+        help="Number of processes to run simulations in parallel",
+    )
     output_group = parser.add_argument_group("Output (optional)")
     output_group.add_argument(
         "--output-file", type=str, required=False, help="Path to output F280 csv file"
@@ -127,7 +148,7 @@ def main():
         default=argparse.SUPPRESS,
         help="Show this help message and exit",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(args)
 
     config = load_configuration(args.config_file)
     detailed = args.detailed
@@ -141,6 +162,7 @@ def main():
             verbose=args.verbose,
             pretty=args.pretty,
             detailed=args.detailed,
+            processes=args.processes,
         )
     else:
         totals = run_simulation(
@@ -152,6 +174,7 @@ def main():
             verbose=args.verbose,
             pretty=args.pretty,
             detailed=args.detailed,
+            processes=args.processes,
         )
     print_totals_as_text(args.num_consignments, config, totals)
     if detailed:
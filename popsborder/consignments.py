@@ -24,7 +24,7 @@
 import collections
 import csv
 import math
-import random
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -38,6 +38,9 @@ class Box:
     Box is a view into array of items, i.e. a slice of that array. The
     assumption is that the original, and possibly modifed, items can not
     only be accessed but also modifed through the box.
+
+    Consignments do not store boxes anymore, so this class is kept only for
+    backwards compatibility of :attr:`Consignment.boxes`.
     """
 
     def __init__(self, items):
@@ -53,7 +56,7 @@ class Box:
         return self.items.shape[0]
 
     def __bool__(self):
-        return bool(np.any(self.items > 0))
+        return bool(np.any(self.items))
 
 
 class Consignment(collections.UserDict):
@@ -76,7 +79,6 @@ class Consignment(collections.UserDict):
         items_per_box,
         num_boxes,
         date,
-        boxes,
         origin,
         port,
         pathway,
@@ -88,19 +90,20 @@ class Consignment(collections.UserDict):
         :param items_per_box: integer
         :param num_boxes: integer
         :param date: Array-like object of items
-        :param boxes: Array-like object of boxes
         :param origin: string
         :param port: string
         :param pathway: string
         """
-        super().__init__(
+        super().__init__()
+        # Filling the underlying dictionary directly avoids a separate call
+        # of __setitem__ for each item.
+        self.data.update(
             flower=flower,
             num_items=num_items,
             items=items,
             items_per_box=items_per_box,
             num_boxes=num_boxes,
             date=date,
-            boxes=boxes,
             origin=origin,
             port=port,
             pathway=pathway,
@@ -111,7 +114,6 @@ class Consignment(collections.UserDict):
         self.items_per_box = items_per_box
         self.num_boxes = num_boxes
         self._date = date
-        self.boxes = boxes
         self.origin = origin
         self.port = port
         self.pathway = pathway
@@ -139,21 +141,84 @@ class Consignment(collections.UserDict):
         """Convenient (or transitional) alias for flower"""
         return self.flower
 
+    @property
+    def box_contaminated(self):
+        """Boolean array with True for each box which contains contaminant
+
+        The value is computed from items, so it reflects any modifications
+        of the items.
+        """
+        num_box_slots = self.num_boxes * self.items_per_box
+        if num_box_slots == self.num_items:
+            items = self.items
+        else:
+            # Last box may be only partially filled, so pad it to a full box.
+            items = np.zeros(num_box_slots, dtype=bool)
+            items[: self.num_items] = self.items
+        return items.reshape(self.num_boxes, self.items_per_box).any(axis=1)
+
+    @property
+    def boxes(self):
+        """List of boxes as :class:`Box` objects
+
+        The list is created on each access. Use :meth:`box_items` and
+        :attr:`box_contaminated` instead to avoid creating the box objects.
+        """
+        return [Box(self.box_items(i)) for i in range(self.num_boxes)]
+
+    def box_items(self, box_index):
+        """Get items in a box as a view into items of the consignment
+
+        Items can be modified through the returned array.
+        """
+        start = box_index * self.items_per_box
+        return self.items[start : start + self.items_per_box]
+
     def count_contaminated(self):
         """Count contaminated items in box."""
         return np.count_nonzero(self.items)
 
+    def is_box_contaminated(self, box_index):
+        """Return True if the box contains contaminant
+
+        Only items of the given box are checked.
+        """
+        return bool(self.box_items(box_index).any())
+
     def item_in_box_to_item_index(self, box_index, item_in_box_index):
         """Convert item index in a box to item index in the consignment"""
-        if box_index == 0:
-            return item_in_box_index
-        items = 0
-        for box in self.boxes[:box_index]:
-            items += box.num_items
-        return items + item_in_box_index
+        # All boxes except for the last one are full.
+        return box_index * self.items_per_box + item_in_box_index
+
+
+class ConsignmentGenerator(ABC):
+    """Base class for consignment generators
+
+    Subclasses generate one consignment in :meth:`generate_consignment` and
+    can override :meth:`generate_consignments` to generate many at once.
+    """
+
+    @abstractmethod
+    def generate_consignment(self):
+        """Generate a new consignment"""
 
+    def generate_consignments(self, num_consignments, reuse_items=False):
+        """Generate given number of new consignments
 
-class ParameterConsignmentGenerator:
+        Consignments are generated lazily one by one.
+
+        If *reuse_items* is True, the generator may reuse memory of items of
+        one consignment for items of the next one, so items of a consignment
+        are valid only until the next consignment is requested.
+        """
+        # Consignments created one by one never share memory of items, which is
+        # always allowed. The parameter is kept for a common signature.
+        del reuse_items
+        for unused_i in range(num_consignments):
+            yield self.generate_consignment()
+
+
+class ParameterConsignmentGenerator(ConsignmentGenerator):
     """Generate a consignments based on configuration parameters"""
 
     def __init__(self, parameters, items_per_box, start_date):
@@ -172,24 +237,71 @@ class ParameterConsignmentGenerator:
         self.date = start_date
 
     def generate_consignment(self):
-        """Generate a new consignment"""
-        port = random.choice(self.params["ports"])
-        # flowers or commodities
-        flower = random.choice(self.params["flowers"])
-        origin = random.choice(self.params["origins"])
+        """Generate a new consignment
+
+        The properties are drawn in the same way as by
+        :meth:`generate_consignments`.
+        """
+        return next(self.generate_consignments(1))
+
+    def generate_consignments(self, num_consignments, reuse_items=False):
+        """Generate given number of new consignments
+
+        Random properties of all consignments are drawn at once on the first
+        request for a consignment. Consignments themselves are created
+        one by one.
+
+        The properties are drawn consignment by consignment from the NumPy global
+        random state, so with the same seed, the consignments are the same as
+        from repeated calls of :meth:`generate_consignment` (as long as nothing
+        else draws from the random state between the calls).
+
+        If *reuse_items* is True, items of all consignments are stored in one
+        array, so items of a consignment are valid only until the next
+        consignment is requested.
+        """
+        ports = self.params["ports"]
+        flowers = self.params["flowers"]
+        origins = self.params["origins"]
         num_boxes_min = self.params["boxes"].get("min", 0)
         num_boxes_max = self.params["boxes"]["max"]
         pathway = "None"
-        items_per_box = self.items_per_box
-        items_per_box = get_items_per_box(items_per_box, pathway)
-        num_boxes = random.randint(num_boxes_min, num_boxes_max)
+        items_per_box = get_items_per_box(self.items_per_box, pathway)
+        # One row per consignment with indexes of port, flower, and origin
+        # and with number of boxes.
+        draws = np.random.randint(
+            [0, 0, 0, num_boxes_min],
+            [len(ports), len(flowers), len(origins), num_boxes_max + 1],
+            size=(num_consignments, 4),
+        )
+        if reuse_items and num_consignments:
+            items_buffer = np.empty(items_per_box * draws[:, 3].max(), dtype=np.uint8)
+        else:
+            items_buffer = None
+        for i in range(num_consignments):
+            yield self._create_consignment(
+                flower=flowers[draws[i, 1]],
+                origin=origins[draws[i, 2]],
+                port=ports[draws[i, 0]],
+                pathway=pathway,
+                items_per_box=items_per_box,
+                num_boxes=int(draws[i, 3]),
+                items_buffer=items_buffer,
+            )
+
+    def _create_consignment(
+        self, flower, origin, port, pathway, items_per_box, num_boxes, items_buffer=None
+    ):
+        """Create consignment with given properties and the next date
+
+        If *items_buffer* is provided, items are a view into it.
+        """
         num_items = items_per_box * num_boxes
-        items = np.zeros(num_items, dtype=np.int64)
-        boxes = []
-        for i in range(num_boxes):
-            lower = i * items_per_box
-            upper = (i + 1) * items_per_box
-            boxes.append(Box(items[lower:upper]))
+        if items_buffer is None:
+            items = np.zeros(num_items, dtype=np.uint8)
+        else:
+            items = items_buffer[:num_items]
+            items.fill(0)
         self.num_generated += 1
         # two consignments every nth day
         if self.num_generated % 3:
@@ -202,14 +314,13 @@ class ParameterConsignmentGenerator:
             items_per_box=items_per_box,
             num_boxes=num_boxes,
             date=self.date,
-            boxes=boxes,
             origin=origin,
             port=port,
             pathway=pathway,
         )
 
 
-class F280ConsignmentGenerator:
+class F280ConsignmentGenerator(ConsignmentGenerator):
     """Generate a consignments based on existing F280 records"""
 
     def __init__(self, items_per_box, filename, separator=","):
@@ -227,7 +338,7 @@ class F280ConsignmentGenerator:
             ) from None
 
         num_items = int(record["QUANTITY"])
-        items = np.zeros(num_items, dtype=np.int64)
+        items = np.zeros(num_items, dtype=np.uint8)
 
         pathway = record["PATHWAY"]
         items_per_box = self.items_per_box
@@ -236,13 +347,6 @@ class F280ConsignmentGenerator:
         # rounding up to keep the max per box and have enough boxes
         num_boxes = int(math.ceil(num_items / float(items_per_box)))
         num_boxes = max(num_boxes, 1)
-        boxes = []
-        for i in range(num_boxes):
-            lower = i * items_per_box
-            # slicing does not go over the size even if our last box is smaller
-            upper = (i + 1) * items_per_box
-            boxes.append(Box(items[lower:upper]))
-        assert sum([box.num_items for box in boxes]) == num_items
 
         date = datetime.strptime(record["REPORT_DT"], "%Y-%m-%d")
         return Consignment(
@@ -252,14 +356,13 @@ class F280ConsignmentGenerator:
             items_per_box=items_per_box,
             num_boxes=num_boxes,
             date=date,
-            boxes=boxes,
             origin=record["ORIGIN_NM"],
             port=record["LOCATION"],
             pathway=pathway,
         )
 
 
-class AQIMConsignmentGenerator:
+class AQIMConsignmentGenerator(ConsignmentGenerator):
     """Generate a consignments based on existing AQIM records"""
 
     def __init__(self, items_per_box, filename, separator=","):
@@ -289,18 +392,11 @@ class AQIMConsignmentGenerator:
         else:
             raise RuntimeError(f"Unsupported quantity unit: {unit}")
 
-        items = np.zeros(num_items, dtype=np.int64)
+        items = np.zeros(num_items, dtype=np.uint8)
 
         # rounding up to keep the max per box and have enough boxes
         num_boxes = int(math.ceil(num_items / float(items_per_box)))
         num_boxes = max(num_boxes, 1)
-        boxes = []
-        for i in range(num_boxes):
-            lower = i * items_per_box
-            # slicing does not go over the size even if our last box is smaller
-            upper = (i + 1) * items_per_box
-            boxes.append(Box(items[lower:upper]))
-        assert sum([box.num_items for box in boxes]) == num_items
 
         date = record["CALENDAR_YR"]
         return Consignment(
@@ -310,7 +406,6 @@ class AQIMConsignmentGenerator:
             items_per_box=items_per_box,
             num_boxes=num_boxes,
             date=date,
-            boxes=boxes,
             origin=record["ORIGIN"],
             port=record["LOCATION"],
             pathway=pathway,
@@ -25,6 +25,7 @@ import math
 import random
 from collections.abc import Mapping
 from datetime import datetime
+from functools import lru_cache
 
 import numpy as np
 from scipy import stats
@@ -49,31 +50,36 @@ def add_contaminant_to_random_box(config, consignment, contamination_rate=None):
     contaminant_ratio = config["ratio"]
     if random.random() >= contaminant_probability:
         return
-    for box in consignment.boxes:
-        if random.random() < contaminant_ratio:
-            in_box = config.get("in_box_arrangement", "all")
-            if in_box == "first":
-                # simply put one contaminant to first item in the box
-                box.items[0] = 1
-            elif in_box == "all":
-                box.items.fill(1)
-            elif in_box == "one_random":
-                index = np.random.choice(box.num_items - 1)
-                box.items[index] = 1
-            elif in_box == "random":
-                if not contamination_rate:
-                    raise ValueError(
-                        "contamination_rate must be set if arrangement is random"
-                    )
-                num_contaminated_items = num_items_to_contaminate(
-                    contamination_rate, box.num_items
-                )
-                if num_contaminated_items == 0:
-                    continue
-                indexes = np.random.choice(
-                    box.num_items, num_contaminated_items, replace=False
+    in_box = config.get("in_box_arrangement", "all")
+    # Draw for all boxes at once which boxes will be contaminated.
+    box_indexes = np.flatnonzero(
+        np.random.random(consignment.num_boxes) < contaminant_ratio
+    )
+    for box_index in box_indexes:
+        box_items = consignment.box_items(box_index)
+        num_box_items = box_items.shape[0]
+        if in_box == "first":
+            # simply put one contaminant to first item in the box
+            box_items[0] = 1
+        elif in_box == "all":
+            box_items.fill(1)
+        elif in_box == "one_random":
+            index = np.random.choice(num_box_items - 1)
+            box_items[index] = 1
+        elif in_box == "random":
+            if not contamination_rate:
+                raise ValueError(
+                    "contamination_rate must be set if arrangement is random"
                 )
-                np.put(box.items, indexes, 1)
+            num_contaminated_items = num_items_to_contaminate(
+                contamination_rate, num_box_items
+            )
+            if num_contaminated_items == 0:
+                continue
+            indexes = np.random.choice(
+                num_box_items, num_contaminated_items, replace=False
+            )
+            np.put(box_items, indexes, 1)
 
 
 def get_contamination_rate(config):
@@ -133,23 +139,22 @@ def add_contaminant_uniform_random(config, consignment):
         )
         # Contaminate full boxes except for last one
         for box_index in box_indexes[:-1]:
-            consignment.boxes[box_index].items.fill(1)
+            consignment.box_items(box_index).fill(1)
         # Use remainder of contaminated_boxes to partially contaminate
         # last box if needed
         partial_box_proportion = math.modf(contaminated_boxes)[0]
         # If contaminated_boxes is whole number, contaminate full box
         if partial_box_proportion == 0.0:
             partial_box_proportion = 1
+        last_box_items = consignment.box_items(box_indexes[-1])
         partial_box_contaminated_stems = round(
-            consignment.boxes[box_indexes[-1]].num_items * partial_box_proportion
-        )
-        consignment.boxes[box_indexes[-1]].items[0:partial_box_contaminated_stems].fill(
-            1
+            last_box_items.shape[0] * partial_box_proportion
         )
+        last_box_items[0:partial_box_contaminated_stems].fill(1)
         # Check if correct number of boxes contaminated, should be rounded up
         # contaminated_boxes, or may be rounded down contaminated_boxes
         # if no stems were contaminated in last partial box
-        assert np.count_nonzero(consignment.boxes) in (
+        assert np.count_nonzero(consignment.box_contaminated) in (
             math.ceil(contaminated_boxes),
             math.floor(contaminated_boxes),
         )
@@ -219,7 +224,7 @@ def _contaminated_boxes_to_cluster_sizes(
     return cluster_sizes
 
 
-def choose_strata_for_clusters(num_units, cluster_width, num_clusters):
+def choose_strata_for_clusters(num_units, cluster_width, num_clusters, rng=None):
     """Divide array of items or boxes into strata wide enough for clusters
     so that they do not overlap. If array is not equally divisible by cluster_width,
     create one smaller strata that can be used for a smaller cluster if needed.
@@ -233,7 +238,11 @@ def choose_strata_for_clusters(num_units, cluster_width, num_clusters):
     num_units: number of boxes or items in consignment
     cluster_width: size of cluster in terms of boxes or units
     num_clusters: number of clusters to contaminate
+    rng: random number generator such as numpy.random.Generator
+    (NumPy global random state is used by default)
     """
+    if rng is None:
+        rng = np.random
     # Round up so that one smaller remainder stratum is included
     num_strata = max(1, math.ceil(num_units / cluster_width))
     # Make sure there are enough strata for the number of clusters needed.
@@ -251,18 +260,30 @@ def choose_strata_for_clusters(num_units, cluster_width, num_clusters):
     else:
         # if no remainder (all strata are equal length), select any strata for clusters
         if num_units % cluster_width == 0:
-            cluster_strata = np.random.choice(num_strata, num_clusters, replace=False)
+            cluster_strata = rng.choice(num_strata, num_clusters, replace=False)
         # if last strata is smaller and not all strata are needed,
         # do not include last strata as option for placing clusters
         else:
-            cluster_strata = np.random.choice(
-                num_strata - 1, num_clusters, replace=False
-            )
+            cluster_strata = rng.choice(num_strata - 1, num_clusters, replace=False)
     return cluster_strata
 
 
-def add_contaminant_clusters_to_boxes(config, consignment):
-    """Add contaminant clusters to boxes in a consignment"""
+def _cluster_starts(num_units, cluster_width, cluster_sizes, rng):
+    """Return index of the first unit of each cluster
+
+    Each cluster is placed into its own stratum *cluster_width* units wide.
+    """
+    cluster_strata = choose_strata_for_clusters(
+        num_units, cluster_width, len(cluster_sizes), rng=rng
+    )
+    return [cluster_width * stratum for stratum in cluster_strata]
+
+
+def add_contaminant_clusters_to_boxes(config, consignment, rng=None):
+    """Add contaminant clusters to boxes in a consignment
+
+    See :func:`add_contaminant_clusters` for the *rng* parameter.
+    """
     contaminated_units_per_cluster = config["clustered"][
         "contaminated_units_per_cluster"
     ]
@@ -275,49 +296,47 @@ def add_contaminant_clusters_to_boxes(config, consignment):
     cluster_sizes = _contaminated_boxes_to_cluster_sizes(
         contaminated_boxes, contaminated_units_per_cluster
     )
-    cluster_strata = choose_strata_for_clusters(
-        num_boxes, contaminated_units_per_cluster, len(cluster_sizes)
+    cluster_starts = _cluster_starts(
+        num_boxes, contaminated_units_per_cluster, cluster_sizes, rng
     )
+    items_per_box = consignment.items_per_box
     # Contaminate full boxes in all clusters except the last one
-    for index, cluster_size in enumerate(cluster_sizes[:-1]):
-        # Find starting index of strata (cluster width * strata index)
-        cluster_start = contaminated_units_per_cluster * cluster_strata[index]
-        cluster_indexes = np.arange(
-            start=cluster_start, stop=cluster_start + cluster_size
-        )
-        for cluster_index in cluster_indexes:
-            consignment.boxes[cluster_index].items.fill(1)
+    for first_box, cluster_size in zip(cluster_starts[:-1], cluster_sizes[:-1]):
+        # Boxes in a cluster are next to each other, so are their items.
+        consignment.items[
+            first_box * items_per_box : (first_box + cluster_size) * items_per_box
+        ] = 1
     # In last box of last cluster, contaminate partial box if needed
-    cluster_start = (
-        contaminated_units_per_cluster * cluster_strata[len(cluster_sizes) - 1]
-    )
-    cluster_indexes = np.arange(
-        start=cluster_start, stop=cluster_start + cluster_sizes[-1]
-    )
-    for cluster_index in cluster_indexes[:-1]:
-        consignment.boxes[cluster_index].items.fill(1)
+    last_box_index = cluster_starts[-1] + cluster_sizes[-1] - 1
+    consignment.items[
+        cluster_starts[-1] * items_per_box : last_box_index * items_per_box
+    ] = 1
     # Use remainder of contaminated_boxes to partially contaminate last box
     partial_box_proportion = math.modf(contaminated_boxes)[0]
     # If contaminated_boxes is whole number, contaminate full box
     if partial_box_proportion == 0.0:
         partial_box_proportion = 1
+    last_box_items = consignment.box_items(last_box_index)
     partial_box_contaminated_stems = round(
-        consignment.boxes[cluster_indexes[-1]].num_items * partial_box_proportion
-    )
-    consignment.boxes[cluster_indexes[-1]].items[0:partial_box_contaminated_stems].fill(
-        1
+        last_box_items.shape[0] * partial_box_proportion
     )
+    last_box_items[0:partial_box_contaminated_stems].fill(1)
     # Check if correct number of boxes contaminated, should be rounded up
     # contaminated_boxes, or may be rounded down contaminated_boxes
     # if no stems were contaminated in last partial box
-    assert np.count_nonzero(consignment.boxes) in (
+    assert np.count_nonzero(consignment.box_contaminated) in (
         math.ceil(contaminated_boxes),
         math.ceil(contaminated_boxes) - 1,
     )
 
 
-def add_contaminant_clusters_to_items(config, consignment):
-    """Add contaminant clusters to items in a consignment"""
+def add_contaminant_clusters_to_items(config, consignment, rng=None):
+    """Add contaminant clusters to items in a consignment
+
+    See :func:`add_contaminant_clusters` for the *rng* parameter.
+    """
+    if rng is None:
+        rng = np.random
     contaminated_units_per_cluster = config["clustered"][
         "contaminated_units_per_cluster"
     ]
@@ -342,11 +361,10 @@ def add_contaminant_clusters_to_items(config, consignment):
             )
         # cluster can't be wider/longer than the current list of items
         cluster_item_width = min(cluster_item_width, num_items)
-        cluster_strata = choose_strata_for_clusters(
-            num_items, cluster_item_width, len(cluster_sizes)
+        cluster_starts = _cluster_starts(
+            num_items, cluster_item_width, cluster_sizes, rng
         )
-        for index, cluster_size in enumerate(cluster_sizes):
-            cluster_start = cluster_item_width * cluster_strata[index]
+        for cluster_start, cluster_size in zip(cluster_starts, cluster_sizes):
             # Use smaller cluster width if placing items in smaller remainder stratum
             cluster_width = min(
                 cluster_item_width, (consignment.num_items - cluster_start)
@@ -354,44 +372,59 @@ def add_contaminant_clusters_to_items(config, consignment):
             assert (
                 cluster_width >= cluster_size
             ), "Not enough items available to contaminate in selected cluster stratum."
-            cluster = np.random.choice(cluster_width, cluster_size, replace=False)
+            cluster = rng.choice(cluster_width, cluster_size, replace=False)
             cluster += cluster_start
-            cluster_indexes.extend(list(cluster))
+            cluster_indexes.append(cluster)
     elif distribution == "continuous":
-        cluster_strata = choose_strata_for_clusters(
-            num_items, contaminated_units_per_cluster, len(cluster_sizes)
+        cluster_starts = _cluster_starts(
+            num_items, contaminated_units_per_cluster, cluster_sizes, rng
         )
-        for index, cluster_size in enumerate(cluster_sizes):
-            cluster = np.arange(cluster_size)
-            cluster_start = contaminated_units_per_cluster * cluster_strata[index]
-            cluster += cluster_start
-            cluster_indexes.extend(list(cluster))
+        for cluster_start, cluster_size in zip(cluster_starts, cluster_sizes):
+            cluster_indexes.append(
+                np.arange(cluster_start, cluster_start + cluster_size)
+            )
     else:
         raise RuntimeError(f"Unknown cluster distribution: {distribution}")
-    cluster_indexes = np.array(cluster_indexes, dtype=np.int64)
-    assert min(cluster_indexes) >= 0, "Cluster values need to be valid indices"
-    assert max(cluster_indexes) < num_items
+    # Join the clusters at once instead of extending a list item by item.
+    cluster_indexes = np.concatenate(cluster_indexes).astype(np.int64, copy=False)
+    assert cluster_indexes.min() >= 0, "Cluster values need to be valid indices"
+    assert cluster_indexes.max() < num_items
     np.put(consignment.items, cluster_indexes, 1)
     assert np.count_nonzero(consignment.items) == contaminated_items
 
 
-def add_contaminant_clusters(config, consignment):
+def add_contaminant_clusters(config, consignment, rng=None):
     """Add contaminant clusters to consignment
 
     Item (separately or in boxes) with contaminat in *consignment* evaluate
     to True after running this function.
     This function does not touch the not items not selected for contamination.
     However, they are expected to be zero.
+
+    Placement of clusters uses *rng* which can be a numpy.random.Generator
+    (e.g., from numpy.random.default_rng). NumPy global random state
+    (seeded by :func:`popsborder.simulation.random_seed`) is used by default.
+    The number of contaminated units is always drawn using the global state.
     """
     contamination_unit = config["contamination_unit"]
     if contamination_unit in ["box", "boxes"]:
-        add_contaminant_clusters_to_boxes(config, consignment)
+        add_contaminant_clusters_to_boxes(config, consignment, rng=rng)
     elif contamination_unit in ["item", "items"]:
-        add_contaminant_clusters_to_items(config, consignment)
+        add_contaminant_clusters_to_items(config, consignment, rng=rng)
     else:
         raise RuntimeError(f"Unknown contamination unit: {contamination_unit}")
 
 
+@lru_cache(maxsize=256)
+def _text_to_date(text):
+    """Convert date in a rule from text to datetime.date
+
+    The same rules are evaluated for every consignment, so the conversions
+    are cached.
+    """
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
 def consignment_matches_selection_rule(rule, consignment):
     """Return True if the *consignment* matches the selection *rule*."""
     # Commodity properties used for selection default to None.
@@ -412,9 +445,9 @@ def consignment_matches_selection_rule(rule, consignment):
     end_date = rule.get("end_date")
     # YAML converts to date, but JSON and other load config methods do not.
     if start_date and isinstance(start_date, str):
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
+        start_date = _text_to_date(start_date)
     if end_date and isinstance(end_date, str):
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
+        end_date = _text_to_date(end_date)
     if not start_date and not end_date:
         return True
     elif start_date and consignment.date < start_date:
@@ -424,7 +457,21 @@ def consignment_matches_selection_rule(rule, consignment):
     return True
 
 
-def get_contamination_config_for_consignment(config, consignment):
+def rules_for_commodity_and_origin(rules, commodity, origin):
+    """Get selection rules which can match the given commodity and origin
+
+    Rules without commodity or origin match any value. The order of rules
+    is preserved, so the first matching rule is the same as for all rules.
+    """
+    return [
+        rule
+        for rule in rules
+        if (not rule.get("commodity") or rule.get("commodity") == commodity)
+        and (not rule.get("origin") or rule.get("origin") == origin)
+    ]
+
+
+def get_contamination_config_for_consignment(config, consignment, rules=None):
     """Get contamination configuration for specific consignment
 
     If the *config* contains consignment-specific settings under
@@ -452,11 +499,17 @@ def get_contamination_config_for_consignment(config, consignment):
     *config*.
 
     In all cases, a copy the config dictionary is returned.
+
+    If *rules* are provided, only these rules are evaluated instead of all rules
+    under the consignments key. This can be used to skip rules which cannot
+    match the consignment (see :func:`rules_for_commodity_and_origin`).
     """
     contaminated_consignments = config.get("consignments")
     if not contaminated_consignments:
         # No consignment-specific info, all consignments use the same config.
         return config.copy()
+    if rules is not None:
+        contaminated_consignments = rules
     # Consignment-specific input provided, create the right config for the consignment
     # if the consignment is configured to be contaminated.
     for item in contaminated_consignments:
@@ -500,13 +553,22 @@ def create_contaminant_function(config):
     """
     arrangement = config.get("arrangement")
     if arrangement == "random_box":
+        random_box_config = config["random_box"]
+        contamination_rate = config["contamination_rate"]
+        if random_box_config["probability"] <= 0 or random_box_config["ratio"] <= 0:
 
-        def add_contaminant_function(consignment):
-            return add_contaminant_to_random_box(
-                config=config["random_box"],
-                consignment=consignment,
-                contamination_rate=config["contamination_rate"],
-            )
+            def add_contaminant_function(unused_consignment):
+                # No consignment or no box is ever contaminated.
+                return None
+
+        else:
+
+            def add_contaminant_function(consignment):
+                return add_contaminant_to_random_box(
+                    config=random_box_config,
+                    consignment=consignment,
+                    contamination_rate=contamination_rate,
+                )
 
     elif arrangement == "random":
 
@@ -534,11 +596,22 @@ def get_contaminant_function(config):
         # which first picks the right config based on its consignment parameter, then
         # creates an add contaminant function based on this config, and then it calls
         # the function with the consignment.
+        contamination_config = config["contamination"]
+        # Rules which can match a commodity-origin combination are collected
+        # when the combination is first seen.
+        rules_by_combo = {}
 
         def add_contaminant_function(consignment):
             """Picks config for the consignment and then call the specific function"""
+            combo = (consignment.commodity, consignment.origin)
+            rules = rules_by_combo.get(combo)
+            if rules is None:
+                rules = rules_for_commodity_and_origin(
+                    contamination_config["consignments"] or [], *combo
+                )
+                rules_by_combo[combo] = rules
             consignment_specific_config = get_contamination_config_for_consignment(
-                config["contamination"], consignment
+                contamination_config, consignment, rules=rules
             )
             if not consignment_specific_config:
                 # Do not contaminate this consignment.
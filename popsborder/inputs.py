@@ -26,6 +26,7 @@ import math
 import sys
 import types
 from collections.abc import Iterable, Mapping
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -54,6 +55,17 @@ def text_to_value(arg):
                 return True
             if arg in ["false", "False", "FALSE"]:
                 return False
+            # Numbers and unpadded booleans are handled above, so only objects,
+            # arrays, strings, null, and booleans surrounded by whitespace remain.
+            # Other text is returned without trying to parse it (and without
+            # the cost of a decoding error).
+            stripped = arg.strip()
+            if stripped[:1] not in ("[", "{", '"') and stripped not in (
+                "null",
+                "true",
+                "false",
+            ):
+                return arg
             try:
                 return json.loads(arg)
             except json.JSONDecodeError:
@@ -125,19 +137,39 @@ def update_config(config, record):
 
 
 def load_configuration_yaml_from_text(text):
-    """Return configuration dictionary from YAML in a string"""
+    """Return configuration dictionary from YAML in a string
+
+    The libyaml-based safe loader is used when available.
+
+    Configurations parsed from strings are cached, so a new copy is returned
+    for each call.
+    """
+    if not isinstance(text, str):
+        # Streams can't be used as cache keys.
+        return _parse_yaml(text)
+    # The cached configuration must not be modified by the caller.
+    return copy.deepcopy(_load_configuration_yaml_from_text_cached(text))
+
+
+@lru_cache(maxsize=512)
+def _load_configuration_yaml_from_text_cached(text):
+    """Parse YAML text for :func:`load_configuration_yaml_from_text`"""
+    return _parse_yaml(text)
+
+
+def _parse_yaml(text):
+    """Parse YAML from a string or a stream using the fastest safe loader"""
     import yaml  # pylint: disable=import-outside-toplevel
 
-    if hasattr(yaml, "full_load"):
-        return yaml.full_load(text)
-    return yaml.load(text)  # pylint: disable=no-value-for-parameter
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(text, Loader=loader)
 
 
 def load_one_configuration(filename, sheet=None, key_column=None, value_column=None):
     """Get the configuration from a JSON or YAML file
 
     The format is decided based on the file extension.
-    It uses full_load() (FullLoader) to read YAML.
+    YAML is read using the safe loader (libyaml-based one when available).
 
     The parameter can be a string or a path object (path-like object).
 
@@ -147,6 +179,8 @@ def load_one_configuration(filename, sheet=None, key_column=None, value_column=N
     `=`, `:`, or `: ` and individual pairs separated by `,`.
     The same information can be passed directly as function parameters.
     If both are provided, function parameters take precedence.
+
+    Content of files is cached as long as the files do not change.
     """
     if isinstance(filename, Iterable) and not isinstance(filename, str):
         return record_to_nested_dictionary(filename)
@@ -165,20 +199,42 @@ def load_one_configuration(filename, sheet=None, key_column=None, value_column=N
     if value_column:
         info.value_column = value_column
 
+    # The same file reached through different paths shares one cache entry.
+    filename = filename.resolve()
+    file_stat = filename.stat()
+    config = _load_configuration_file_cached(
+        str(filename),
+        file_stat.st_mtime_ns,
+        file_stat.st_size,
+        sheet=info.sheet,
+        key_column=info.key_column,
+        value_column=info.value_column,
+    )
+    # The cached configuration must not be modified by the caller.
+    return copy.deepcopy(config)
+
+
+@lru_cache(maxsize=32)
+def _load_configuration_file_cached(
+    filename, mtime, size, sheet, key_column, value_column
+):
+    """Load configuration from a file for :func:`load_one_configuration`
+
+    File modification time and size are used only as part of the cache key.
+    """
+    # pylint: disable=unused-argument
+    filename = Path(filename)
     if str(filename).endswith(".json"):
         return json.load(open(filename))
     elif str(filename).endswith(".yaml") or str(filename).endswith(".yml"):
-        import yaml  # pylint: disable=import-outside-toplevel
-
-        if hasattr(yaml, "full_load"):
-            return yaml.full_load(open(filename))
-        return yaml.load(open(filename))  # pylint: disable=no-value-for-parameter
+        with open(filename) as file:
+            return _parse_yaml(file)
     elif filename.suffix.lower() in [".csv", ".xlsx", ".ods"]:
         return load_config_table(
             filename,
-            sheet=info.sheet,
-            key_column=info.key_column,
-            value_column=info.value_column,
+            sheet=sheet,
+            key_column=key_column,
+            value_column=value_column,
         )
     else:
         sys.exit("Unknown file extension (file: {filename})")
@@ -219,7 +275,7 @@ def load_configuration(filename, sheet=None, key_column=None, value_column=None)
     """Get the configuration from a JSON or YAML file
 
     The format is decided based on the file extension.
-    It uses full_load() (FullLoader) to read YAML.
+    YAML is read using the safe loader (libyaml-based one when available).
 
     The parameter can be a string or a path object (path-like object).
 
@@ -396,7 +452,6 @@ def load_config_xlsx(filename, sheet=None, key_column=None, value_column=None):
     table = {}
 
     # pylint: disable=import-outside-toplevel
-    import openpyxl
     from openpyxl.utils import column_index_from_string
 
     key_column = column_from_string(
@@ -408,8 +463,38 @@ def load_config_xlsx(filename, sheet=None, key_column=None, value_column=None):
         fallback=lambda x: column_index_from_string(x) - 1,
     )
 
+    file_stat = Path(filename).stat()
+    rows = _load_xlsx_rows_cached(
+        str(filename), file_stat.st_mtime_ns, file_stat.st_size, sheet
+    )
+    for row in rows:
+        key = validate_key(row[key_column])
+        if key:
+            # Consider only rows with filled key to allow
+            # for empty rows for formatting purposes.
+            # Additionally, ignore rows where key cell contains
+            # spaces (this allows for a header without threating
+            # first row differently).
+            value = text_to_value(row[value_column])
+            table[key] = value
+    return record_to_nested_dictionary(table)
+
+
+@lru_cache(maxsize=8)
+def _load_xlsx_rows_cached(filename, mtime, size, sheet):
+    """Read all cell values from a XLSX sheet as a tuple of rows.
+
+    The modification time and size of the file are part of the cache key
+    so that the file is parsed again when it changes. Reading the values
+    for different key and value columns then requires only one parse.
+    """
+    # Parameters mtime and size are used only as a part of the cache key.
+    # pylint: disable=unused-argument
+    # pylint: disable=import-outside-toplevel
     import warnings
 
+    import openpyxl
+
     with warnings.catch_warnings():
         # We want to use validation functions in the spreadsheet,
         # but it does not matter whether they are supported by the reader here.
@@ -423,23 +508,12 @@ def load_config_xlsx(filename, sheet=None, key_column=None, value_column=None):
                 sheet = workbook[sheet]
             else:
                 sheet = workbook.active
-            # Read rows excluding the header.
-            for row in sheet.iter_rows(values_only=True):
-                key = validate_key(row[key_column])
-                if key:
-                    # Consider only rows with filled key to allow
-                    # for empty rows for formatting purposes.
-                    # Additionally, ignore rows where key cell contains
-                    # spaces (this allows for a header without threating
-                    # first row differently).
-                    value = text_to_value(row[value_column])
-                    table[key] = value
+            return tuple(sheet.iter_rows(values_only=True))
         finally:
             # Read-only mode requires an explicit close and
             # the workbook object is not a context manager.
             if workbook:
                 workbook.close()
-        return record_to_nested_dictionary(table)
 
 
 def load_config_ods(filename, sheet=None, key_column=None, value_column=None):
@@ -513,14 +587,25 @@ def add_dict_config_to_table(table, value, keys=None):
     if keys is None:
         keys = []
     if isinstance(value, Mapping):
-        for nested_key, nested_value in value.items():
-            new_keys = keys.copy()
-            new_keys.append(nested_key)
-            add_dict_config_to_table(table, value=nested_value, keys=new_keys)
+        prefix = "".join(f"{key}/" for key in keys)
+        _add_mapping_to_table(table, value, prefix)
     else:
         table["/".join(keys)] = value
 
 
+def _add_mapping_to_table(table, mapping, prefix):
+    """Add items of a nested mapping to a table with keys starting with prefix
+
+    The key is extended by a string concatenation at each level instead of
+    building a new list of keys for each item.
+    """
+    for key, value in mapping.items():
+        if isinstance(value, Mapping):
+            _add_mapping_to_table(table, value, f"{prefix}{key}/")
+        else:
+            table[f"{prefix}{key}"] = value
+
+
 def dict_config_to_table(value):
     """Convert a nested dictionary to a table represented by a mapping"""
     table = {}
@@ -548,33 +633,43 @@ def load_scenario_table(filename):
 
     A whole file is read and loaded into memory unlike with the ``csv.reader()``
     function.
+
+    Loaded tables are cached as long as the file does not change.
+    A new list is returned for each call.
+    """
+    file_stat = Path(filename).stat()
+    table = _load_scenario_table_cached(
+        str(filename), file_stat.st_mtime_ns, file_stat.st_size
+    )
+    # The cached table must not be modified by the caller.
+    return copy.deepcopy(table)
+
+
+@lru_cache(maxsize=16)
+def _load_scenario_table_cached(filename, mtime, size):
+    """Load scenario table for :func:`load_scenario_table`
+
+    File modification time and size are used only as part of the cache key.
     """
-    # pylint: disable=import-outside-toplevel
     table = []
 
     # Read spreadsheet formats
     if Path(filename).suffix.lower() != ".csv":
-        import openpyxl
-
-        try:
-            workbook = openpyxl.load_workbook(filename, read_only=True)
-            sheet = workbook.active
-            # Get header.
-            header = [cell.value for cell in sheet[1]]
-            # Read rows excluding the header.
-            for old_row in sheet.iter_rows(min_row=2):
-                new_row = {}
-                for key, cell in zip(header, old_row):
-                    new_row[key] = text_to_value(cell.value)
-                table.append(new_row)
-        finally:
-            # Read-only mode requires an explicit close and
-            # the workbook object is not a context manager.
-            workbook.close()
+        rows = _load_xlsx_rows_cached(filename, mtime, size, None)
+        if not rows:
+            return table
+        # Get header and read rows excluding the header.
+        header = rows[0]
+        for old_row in rows[1:]:
+            new_row = {}
+            for key, value in zip(header, old_row):
+                new_row[key] = text_to_value(value)
+            table.append(new_row)
         return table
 
     # Read as CSV
     with open(filename) as file:
+        # pylint: disable=import-outside-toplevel
         import csv
 
         for row in csv.DictReader(file):
@@ -595,30 +690,48 @@ def load_cfrp_schedule(filename, date_format=None):
 
     Returns a dictionary with keys being tuples of commodity and origin and values
     being a set of dates.
+
+    Loaded schedules are cached as long as the file does not change.
+    A new dictionary is returned for each call.
     """
     if not date_format:
         date_format = "%Y-%m-%d"
-    schedule = {}
-    # Read as CSV
-    with open(filename) as file:
-        # Import file- or format-specific items only when need.
-        # pylint: disable=import-outside-toplevel
-        import csv
-        from datetime import datetime
+    file_stat = Path(filename).stat()
+    schedule = _load_cfrp_schedule_cached(
+        str(filename), file_stat.st_mtime_ns, file_stat.st_size, date_format
+    )
+    return {combo: set(dates) for combo, dates in schedule.items()}
 
-        for row in csv.DictReader(file):
-            for key, value in row.items():
-                if key.lower() == "date":
-                    date = datetime.strptime(value, date_format).date()
-                elif key.lower() == "origin_nm":
-                    origin = value
-                elif key.lower() == "commodity":
-                    commodity = value
-            combo = (commodity, origin)
-            if combo not in schedule:
-                # Using set to ensure we have no duplicate dates.
-                schedule[combo] = set()
-            schedule[combo].add(date)
+
+@lru_cache(maxsize=16)
+def _load_cfrp_schedule_cached(filename, mtime, size, date_format):
+    """Load CFRP schedule for :func:`load_cfrp_schedule`
+
+    File modification time and size are used only as part of the cache key.
+    """
+    # pylint: disable=unused-argument
+    # pylint: disable=import-outside-toplevel
+    import pandas
+
+    # Column names are case-insensitive.
+    columns = {"date", "origin_nm", "commodity"}
+    # Read all values as strings, so that names are not converted to numbers
+    # or missing values (e.g., NA).
+    table = pandas.read_csv(
+        filename,
+        usecols=lambda name: name.lower() in columns,
+        dtype=str,
+        keep_default_na=False,
+    )
+    table.columns = [name.lower() for name in table.columns]
+    # Parse all dates at once and use only unique records.
+    table["date"] = pandas.to_datetime(table["date"], format=date_format).dt.date
+    table = table.drop_duplicates()
+    grouped_dates = table.groupby(["commodity", "origin_nm"], sort=False)["date"]
+    schedule = {}
+    for combo, dates in grouped_dates:
+        # Using set to ensure we have no duplicate dates.
+        schedule[combo] = set(dates)
     return schedule
 
 
@@ -24,20 +24,22 @@
 import math
 import random
 import types
+from functools import lru_cache
 
 import numpy as np
 
 
 def inspect_first(consignment):
     """Inspect only the first box in the consignment"""
-    if consignment.boxes[0]:
+    if consignment.is_box_contaminated(0):
         return False, 1
     return True, 1
 
 
 def inspect_one_random(consignment):
     """Inspect only one randomly picked box in the consignment"""
-    if random.choice(consignment.boxes):
+    box_index = random.randrange(consignment.num_boxes)
+    if consignment.is_box_contaminated(box_index):
         return False, 1
     return True, 1
 
@@ -53,10 +55,11 @@ def inspect_first_n(num_boxes, consignment):
     :param num_boxes: Number of boxes to inspect
     :param consignment: Consignment to inspect
     """
-    num_boxes = min(len(consignment.boxes), num_boxes)
-    for i in range(num_boxes):
-        if consignment.boxes[i]:
-            return False, i + 1
+    num_boxes = min(consignment.num_boxes, num_boxes)
+    box_contaminated = consignment.box_contaminated[:num_boxes]
+    if box_contaminated.any():
+        # Inspection stops at the first contaminated box.
+        return False, int(np.argmax(box_contaminated)) + 1
     return True, num_boxes
 
 
@@ -84,12 +87,15 @@ def sample_proportion(config, consignment):
     return n_units_to_inspect
 
 
+@lru_cache(maxsize=1024)
 def compute_hypergeometric(detection_level, confidence_level, population_size):
     """Get sample size using hypergeometric distribution
 
     Compute sample size using hypergeometric distribution based on population
     size (total number of items or boxes in consignment), detection level,
     and confidence level.
+
+    Results are cached because consignments often have the same size.
     """
     # Equation comes from RBS spreadsheet for calculating hypergeometric
     # sample sizes created by IICA, USDA APHIS PPQ, and NAPPO.
@@ -301,11 +307,11 @@ def select_random_indexes(unit, consignment, n_units_to_inspect):
     """
     if unit in ["item", "items"]:
         indexes_to_inspect = random.sample(
-            list(range(consignment.num_items)), n_units_to_inspect
+            range(consignment.num_items), n_units_to_inspect
         )
     elif unit in ["box", "boxes"]:
         indexes_to_inspect = random.sample(
-            list(range(consignment.num_boxes)), n_units_to_inspect
+            range(consignment.num_boxes), n_units_to_inspect
         )
     else:
         raise RuntimeError(f"Unknown unit: {unit}")
@@ -331,7 +337,7 @@ def select_cluster_indexes(config, consignment, n_units_to_inspect):
             )[0]
             # Choose box indexes randomly
             indexes_to_inspect = random.sample(
-                list(range(consignment.num_boxes)), n_boxes_to_inspect
+                range(consignment.num_boxes), n_boxes_to_inspect
             )
         elif cluster_selection == "interval":
             interval = config["inspection"]["cluster"]["interval"]
@@ -389,6 +395,33 @@ def select_units_to_inspect(config, consignment, n_units_to_inspect):
     return indexes_to_inspect
 
 
+def count_unique_sorted(values):
+    """Count unique values in a sorted 1D array"""
+    if not values.shape[0]:
+        return 0
+    return int(np.count_nonzero(values[1:] != values[:-1])) + 1
+
+
+def count_inspected_box_items(consignment, box_index, box_sample, ret, detailed):
+    """Count inspected and contaminated items in a sample of items from one box
+
+    When *detailed* is True, indexes of the inspected items are recorded
+    in *ret*. Return number of inspected items and number of contaminated
+    items in the sample.
+
+    :param consignment: Consignment being inspected
+    :param box_index: Index of the box the sample comes from
+    :param box_sample: Items from the box to be inspected
+    :param ret: Inspection results namespace
+    :param detailed: True if inspected item indexes should be recorded
+    """
+    num_inspected = box_sample.shape[0]
+    if detailed:
+        start = consignment.item_in_box_to_item_index(box_index, 0)
+        ret.inspected_item_indexes.extend(range(start, start + num_inspected))
+    return num_inspected, int(np.count_nonzero(box_sample))
+
+
 def inspect(config, consignment, n_units_to_inspect, detailed):
     """Inspect selected units using both end strategies (to detection, to completion)
     Return number of boxes opened, items inspected, and contaminated items found for
@@ -442,25 +475,19 @@ def inspect(config, consignment, n_units_to_inspect, detailed):
                 # sample size.
                 if sample_remainder < inspect_per_box:
                     inspect_per_box = sample_remainder
-                # In each box, loop through first n items (n = inspect_per_box)
-                for item_in_box_index, item in enumerate(
-                    (consignment.boxes[box_index]).items[0:inspect_per_box]
-                ):
-                    if detailed:
-                        item_index = consignment.item_in_box_to_item_index(
-                            box_index, item_in_box_index
-                        )
-                        ret.inspected_item_indexes.append(item_index)
-                    ret.items_inspected_completion += 1
-                    if not detected:
-                        ret.items_inspected_detection += 1
-                    if item:
-                        # Count all contaminated items in sample, regardless of
-                        # detected variable
-                        ret.contaminated_items_completion += 1
-                        if not detected:
-                            # Count contaminated items in box if not yet detected
-                            ret.contaminated_items_detection += 1
+                # In each box, inspect first n items (n = inspect_per_box)
+                box_sample = consignment.box_items(box_index)[0:inspect_per_box]
+                num_inspected, num_contaminated = count_inspected_box_items(
+                    consignment, box_index, box_sample, ret, detailed
+                )
+                ret.items_inspected_completion += num_inspected
+                # Count all contaminated items in sample, regardless of
+                # detected variable
+                ret.contaminated_items_completion += num_contaminated
+                if not detected:
+                    ret.items_inspected_detection += num_inspected
+                    # Count contaminated items in box if not yet detected
+                    ret.contaminated_items_detection += num_contaminated
                 if ret.contaminated_items_detection > 0:
                     # Update detected variable if contaminated items found in box
                     detected = True
@@ -470,37 +497,31 @@ def inspect(config, consignment, n_units_to_inspect, detailed):
             # ), """Check if number of items is evenly divisible by items per box.
             # Partial boxes not supported when using cluster selection."""
         else:  # All other item selection strategies inspected the same way
-            # Empty lists to hold opened boxes indexes, will be duplicates bc box index
+            # Items in sorted index list (sorted in index functions) are inspected
+            # all at once. Inspection progresses through indexes in ascending order.
+            item_indexes = np.asarray(indexes_to_inspect, dtype=np.int64)
+            if detailed:
+                ret.inspected_item_indexes.extend(indexes_to_inspect)
+            contaminated = consignment.items[item_indexes] != 0
+            # Compute box index numbers, will be duplicates bc box index
             # computed per inspected item
-            boxes_opened_completion = []
-            boxes_opened_detection = []
-            # Loop through items in sorted index list (sorted in index functions)
-            # Inspection progresses through indexes in ascending order
-            for item_index in indexes_to_inspect:
-                if detailed:
-                    ret.inspected_item_indexes.append(item_index)
-                ret.items_inspected_completion += 1
-                # Compute box index number
-                boxes_opened_completion.append(math.floor(item_index / items_per_box))
-                if not detected:
-                    ret.items_inspected_detection += 1
-                    # Compute box index number
-                    boxes_opened_detection.append(
-                        math.floor(item_index / items_per_box)
-                    )
-                if consignment.items[item_index]:
-                    # Count every contaminated item in sample
-                    ret.contaminated_items_completion += 1
-                    if not detected:
-                        ret.contaminated_items_detection += 1
-                        detected = True
-                # Should be only 1 contaminated item if to detection
-                if detected:
-                    assert ret.contaminated_items_detection == 1
+            box_indexes = item_indexes // items_per_box
+            ret.items_inspected_completion = item_indexes.shape[0]
+            # Count every contaminated item in sample
+            ret.contaminated_items_completion = int(np.count_nonzero(contaminated))
+            if ret.contaminated_items_completion:
+                # To detection, inspection stops at the first contaminated item,
+                # so there is only 1 contaminated item.
+                ret.items_inspected_detection = int(np.argmax(contaminated)) + 1
+                ret.contaminated_items_detection = 1
+            else:
+                ret.items_inspected_detection = ret.items_inspected_completion
             # Number of boxes opened is number of unique boxes indexes in boxes
-            # opened lists
-            ret.boxes_opened_completion = len(set(boxes_opened_completion))
-            ret.boxes_opened_detection = len(set(boxes_opened_detection))
+            # opened (box indexes are sorted because item indexes are)
+            ret.boxes_opened_completion = count_unique_sorted(box_indexes)
+            ret.boxes_opened_detection = count_unique_sorted(
+                box_indexes[: ret.items_inspected_detection]
+            )
     elif unit in ["box", "boxes"]:
         # Partial box inspections allowed to reduce number of items inspected if desired
         within_box_proportion = config["inspection"]["within_box_proportion"]
@@ -511,24 +532,18 @@ def inspect(config, consignment, n_units_to_inspect, detailed):
         for box_index in indexes_to_inspect:
             if not detected:
                 ret.boxes_opened_detection += 1
-            # In each box, loop through first n items (n = inspect_per_box)
-            for item_in_box_index, item in enumerate(
-                (consignment.boxes[box_index]).items[0:inspect_per_box]
-            ):
-                if detailed:
-                    item_index = consignment.item_in_box_to_item_index(
-                        box_index, item_in_box_index
-                    )
-                    ret.inspected_item_indexes.append(item_index)
-                if not detected:
-                    ret.items_inspected_detection += 1
-                if item:
-                    # Count every contaminated item in sample
-                    ret.contaminated_items_completion += 1
-                    # If first contaminated box inspected,
-                    # count contaminated items in box
-                    if not detected:
-                        ret.contaminated_items_detection += 1
+            # In each box, inspect first n items (n = inspect_per_box)
+            box_sample = consignment.box_items(box_index)[0:inspect_per_box]
+            num_inspected, num_contaminated = count_inspected_box_items(
+                consignment, box_index, box_sample, ret, detailed
+            )
+            # Count every contaminated item in sample
+            ret.contaminated_items_completion += num_contaminated
+            if not detected:
+                ret.items_inspected_detection += num_inspected
+                # If first contaminated box inspected,
+                # count contaminated items in box
+                ret.contaminated_items_detection += num_contaminated
             # If box contained contaminated items, changed detected variable
             if ret.contaminated_items_detection > 0:
                 detected = True
@@ -567,10 +582,8 @@ def get_sample_function(config):
 
 def is_consignment_contaminated(consignment):
     """Return True if at least one box contains contaminants"""
-    for box in consignment.boxes:
-        if box:
-            return True
-    return False
+    # Any contaminated item means a contaminated box.
+    return bool(np.any(consignment.items))
 
 
 def consignment_contamination_rate(consignment):
@@ -585,11 +598,7 @@ def consignment_contamination_rate(consignment):
 
 def count_contaminated_boxes(consignment):
     """Return number of boxes containing contaminants"""
-    count = 0
-    for box in consignment.boxes:
-        if box:
-            count += 1
-    return count
+    return int(np.count_nonzero(consignment.box_contaminated))
 
 
 def count_contaminated_items(consignment):
@@ -27,7 +27,9 @@ import shutil
 import types
 import weakref
 from collections.abc import MutableMapping
-from functools import reduce
+from functools import lru_cache, reduce
+
+import numpy as np
 
 from .inspections import count_contaminated_boxes
 
@@ -46,16 +48,25 @@ def pretty_content(array, config=None):
     else:
         separator = ""
 
-    def replace(number):
-        if number:
-            return bug_sign
-        else:
-            return flower_sign
-
-    pretty = [replace(i) for i in array]
+    signs = (flower_sign, bug_sign)
+    pretty = [signs[bool(value)] for value in np.asarray(array).tolist()]
     return separator.join(pretty)
 
 
+@lru_cache(maxsize=None)
+def terminal_width():
+    """Return width of the terminal in columns
+
+    The width is determined once and reused afterwards until the cache is cleared
+    (with ``terminal_width.cache_clear()``). :func:`popsborder.simulation.simulation`
+    clears it at the start of each run with pretty output, so a resized terminal
+    is used by the next run.
+    """
+    if hasattr(shutil, "get_terminal_size"):
+        return shutil.get_terminal_size().columns
+    return 80
+
+
 def pretty_header(consignment, line=None, config=None):
     """Return header for a consignment
 
@@ -64,9 +75,7 @@ def pretty_header(consignment, line=None, config=None):
     (The assumption is that this will be printed in the terminal.)
     """
     config = config if config else {}
-    size = 80
-    if hasattr(shutil, "get_terminal_size"):
-        size = shutil.get_terminal_size().columns
+    size = terminal_width()
     if line is None:
         # We test None but not for "" to allow use of an empty string.
         line = config.get("horizontal_line", "heavy")
@@ -113,7 +122,10 @@ def pretty_consignment_boxes(consignment, config=None):
         separator = line
     header = pretty_header(consignment, config=config)
     body = separator.join(
-        [pretty_content(box.items, config=config) for box in consignment["boxes"]]
+        [
+            pretty_content(consignment.box_items(box_index), config=config)
+            for box_index in range(consignment.num_boxes)
+        ]
     )
     return f"{header}\n{body}"
 
@@ -123,7 +135,7 @@ def pretty_consignment_boxes_only(consignment, config=None):
     config = config if config else {}
     line = config.get("horizontal_line", "light")
     header = pretty_header(consignment, line=line, config=config)
-    body = pretty_content(consignment["boxes"], config=config)
+    body = pretty_content(consignment.box_contaminated, config=config)
     return f"{header}\n{body}"
 
 
@@ -177,9 +189,19 @@ class MuteReporter(object):
         pass
 
 
+def _write_rows_and_close(writer, rows, file):
+    """Write remaining rows using a CSV writer and close the file"""
+    writer.writerows(rows)
+    rows.clear()
+    file.close()
+
+
 class Form280(object):
     """Creates F280 records from the simulated data"""
 
+    #: Number of collected rows which triggers writing to the file
+    rows_per_write = 8192
+
     def __init__(self, file, disposition_codes, separator=","):
         """Prepares file for writing
 
@@ -194,8 +216,9 @@ class Form280(object):
                 self.print_to_stdout = True
             else:
                 self.file = open(file, "w")
-                self._finalizer = weakref.finalize(self, self.file.close)
         self.codes = disposition_codes
+        # Many consignments share a date, so formatted dates are reused.
+        self._date_texts = {}
         # selection and order of columns to output
         columns = ["REPORT_DT", "LOCATION", "ORIGIN_NM", "COMMODITY", "disposition"]
 
@@ -208,6 +231,18 @@ class Form280(object):
                 quoting=csv.QUOTE_NONNUMERIC,
             )
             self.writer.writerow(columns)
+            # Rows are collected and written in batches.
+            self._rows = []
+            self._finalizer = weakref.finalize(
+                self, _write_rows_and_close, self.writer, self._rows, self.file
+            )
+
+    def flush(self):
+        """Write all collected rows to the file"""
+        if self.file:
+            self.writer.writerows(self._rows)
+            self._rows.clear()
+            self.file.flush()
 
     def disposition(self, ok, must_inspect, applied_program):
         """Get disposition code for the given parameters
@@ -235,6 +270,14 @@ class Form280(object):
                 disposition = codes.get("inspected_pest", "Pest Found")
         return disposition
 
+    def format_date(self, date):
+        """Get date as text in the format used in the F280 records"""
+        text = self._date_texts.get(date)
+        if text is None:
+            text = date.strftime("%Y-%m-%d")
+            self._date_texts[date] = text
+        return text
+
     def fill(self, date, consignment, ok, must_inspect, applied_program):
         """Fill one entry in the F280 form
 
@@ -246,15 +289,20 @@ class Form280(object):
         """
         disposition_code = self.disposition(ok, must_inspect, applied_program)
         if self.file:
-            self.writer.writerow(
+            if not isinstance(date, str):
+                date = self.format_date(date)
+            self._rows.append(
                 [
-                    date.strftime("%Y-%m-%d"),
+                    date,
                     consignment["port"],
                     consignment["origin"],
                     consignment["flower"],
                     disposition_code,
                 ]
             )
+            if len(self._rows) >= self.rows_per_write:
+                self.writer.writerows(self._rows)
+                self._rows.clear()
         elif self.print_to_stdout:
             print(
                 f"F280: {date:%Y-%m-%d} | {consignment.port} | {consignment.origin}"
@@ -516,6 +564,16 @@ def get_item_from_nested_dict(dictionary, keys):
     return reduce(operator.getitem, keys, dictionary)
 
 
+def _split_column_names(columns):
+    """Get column names in key/subkey format paired with their lists of keys
+
+    Splitting the names once avoids doing it again for each row.
+    """
+    if not columns:
+        return []
+    return [(column, column.split("/")) for column in columns]
+
+
 def _flatten_nested_dict_generator(dictionary, parent_key):
     for key, value in dictionary.items():
         new_key = f"{parent_key}/{key}" if parent_key else key
@@ -539,25 +597,28 @@ def save_scenario_result_to_table(filename, results, config_columns, result_colu
     Values from configuration or results are selected by columns parameters which are
     in format key/subkey/subsubkey.
     """
+    config_keys = _split_column_names(config_columns)
+    result_keys = _split_column_names(result_columns)
+    # Rows are lists in the order of the header, so they are written as they are
+    # without a conversion from a dictionary for each row.
+    rows = (
+        [get_item_from_nested_dict(config, keys) for unused, keys in config_keys]
+        + [
+            get_item_from_nested_dict(result.__dict__, keys)
+            for unused, keys in result_keys
+        ]
+        for result, config in results
+    )
     with open(filename, "w") as file:
-        writer = csv.DictWriter(
+        writer = csv.writer(
             file,
-            config_columns + result_columns,
             delimiter=",",
             quotechar='"',
             lineterminator="\n",
             quoting=csv.QUOTE_MINIMAL,
         )
-        writer.writeheader()
-        for result, config in results:
-            row = {}
-            for column in config_columns:
-                keys = column.split("/")
-                row[column] = get_item_from_nested_dict(config, keys)
-            for column in result_columns:
-                keys = column.split("/")
-                row[column] = get_item_from_nested_dict(result.__dict__, keys)
-            writer.writerow(row)
+        writer.writerow(config_columns + result_columns)
+        writer.writerows(rows)
 
 
 def save_simulation_result_to_pandas(
@@ -582,21 +643,21 @@ def save_scenario_result_to_pandas(results, config_columns=None, result_columns=
     # in case this function is not used.
     import pandas as pd  # pylint: disable=import-outside-toplevel
 
+    config_keys = _split_column_names(config_columns)
+    result_keys = _split_column_names(result_columns)
     rows = []
     for result, config in results:
         row = {}
         if config:
             if config_columns:
-                for column in config_columns:
-                    keys = column.split("/")
+                for column, keys in config_keys:
                     row[column] = get_item_from_nested_dict(config, keys)
             elif config_columns is None:
                 row = flatten_nested_dict(config)
             # When falsy, but not None, we assume it is an empty list and thus an
             # explicit request for no config columns to be included.
         if result_columns:
-            for column in result_columns:
-                keys = column.split("/")
+            for column, keys in result_keys:
                 row[column] = get_item_from_nested_dict(result.__dict__, keys)
         else:
             row.update(vars(result))
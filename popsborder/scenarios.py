@@ -20,12 +20,27 @@
 .. codeauthor:: Vaclav Petras <wenzeslaus gmail com>
 """
 
+import itertools
+import multiprocessing
+
 from .inputs import update_config
-from .simulation import run_simulation
+from .simulation import random_seed, run_simulation
+
+
+def _run_scenario(scenario_name, parameters):
+    """Run simulations for one scenario with parameters from a dictionary"""
+    print(f"Running scenario: {scenario_name}")
+    return run_simulation(**parameters)
 
 
 def run_scenarios(
-    config, scenario_table, seed, num_simulations, num_consignments, detailed=False
+    config,
+    scenario_table,
+    seed,
+    num_simulations,
+    num_consignments,
+    detailed=False,
+    processes=1,
 ):
     """Run scenarios based on the configuration and list of scenarios
 
@@ -43,6 +58,9 @@ def run_scenarios(
         Num of simulations for each scenario.
     num_consignments : int
         Number of shipements in each simulation.
+    processes : int or None
+        Number of processes to run scenarios in parallel (None means number of
+        CPUs). Simulations within one scenario run sequentially.
 
     Returns
     -------
@@ -50,18 +68,31 @@ def run_scenarios(
         List of results with one tuple for each scenario. One tuple contains simulation
         result and configuration for that scenario.
     """
-    results = []
-    for record in scenario_table:
-        scenario_name = record["name"]
-        print(f"Running scenario: {scenario_name}")
-        scenario_config = update_config(config, record)
-        result = run_simulation(
-            config=scenario_config,
-            num_simulations=num_simulations,
-            num_consignments=num_consignments,
-            seed=seed,
-            detailed=detailed,
+    scenario_configs = [update_config(config, record) for record in scenario_table]
+    scenario_arguments = [
+        (
+            record["name"],
+            {
+                "config": scenario_config,
+                "num_simulations": num_simulations,
+                "num_consignments": num_consignments,
+                "seed": seed,
+                "detailed": detailed,
+            },
         )
+        for record, scenario_config in zip(scenario_table, scenario_configs)
+    ]
+    if processes != 1:
+        # Without a seed, each worker process needs its own random state.
+        with multiprocessing.Pool(
+            processes, initializer=random_seed, initargs=(None,)
+        ) as pool:
+            scenario_results = pool.starmap(_run_scenario, scenario_arguments)
+    else:
+        scenario_results = itertools.starmap(_run_scenario, scenario_arguments)
+
+    results = []
+    for result, scenario_config in zip(scenario_results, scenario_configs):
         if detailed:
             # The result is tuple of details ([0]) and simulation totals ([1]).
             results.append((result[0], result[1], scenario_config))
@@ -21,6 +21,7 @@
 .. codeauthor:: Kellyn P. Montgomery <kellynmontgomery gmail com>
 """
 
+import multiprocessing
 import random
 import types
 
@@ -28,18 +29,14 @@ import numpy as np
 
 from .consignments import get_consignment_generator
 from .contamination import get_contaminant_function
-from .inspections import (
-    consignment_contamination_rate,
-    get_sample_function,
-    inspect,
-    is_consignment_contaminated,
-)
+from .inspections import get_sample_function, inspect
 from .outputs import (
     Form280,
     MuteReporter,
     PrintReporter,
     SuccessRates,
     pretty_consignment,
+    terminal_width,
 )
 from .skipping import get_inspection_needed_function
 
@@ -103,13 +100,21 @@ def simulation(
     is_inspection_needed = get_inspection_needed_function(config)
     sample = get_sample_function(config)
     tolerance_level = config["inspection"]["tolerance_level"]
-
-    for unused_i in range(num_consignments):
-        consignment = consignment_generator.generate_consignment()
+    if pretty:
+        # The width is looked up once for this run and reused for each consignment.
+        terminal_width.cache_clear()
+
+    # Each consignment is fully processed before the next one is generated,
+    # so the generator can reuse memory for items.
+    consignments = consignment_generator.generate_consignments(
+        num_consignments, reuse_items=True
+    )
+    for consignment in consignments:
         add_contaminant(consignment)
         if detailed:
-            for box in consignment.boxes:
-                item_details.append(box.items)
+            for box_index in range(consignment.num_boxes):
+                # Items are reused by the next consignment, so we need a copy.
+                item_details.append(consignment.box_items(box_index).copy())
         if pretty:
             pretty_config = config.get("pretty", {})
             print(pretty_consignment(consignment, style=pretty, config=pretty_config))
@@ -144,24 +149,25 @@ def simulation(
             must_inspect,
             applied_program,
         )
-        consignment_actually_ok = not is_consignment_contaminated(consignment)
+        # Count contaminated items only once and derive everything else from that.
+        num_contaminated_items = consignment.count_contaminated()
+        consignment_actually_ok = num_contaminated_items == 0
+        contamination_rate = num_contaminated_items / consignment.num_items
         success_rates.record_success_rate(
             consignment_checked_ok, consignment_actually_ok, consignment
         )
-        true_contamination_rate += consignment_contamination_rate(consignment)
+        true_contamination_rate += contamination_rate
         if not consignment_actually_ok:
             if consignment_checked_ok:
-                if consignment_contamination_rate(consignment) < tolerance_level:
+                if contamination_rate < tolerance_level:
                     missed_within_tolerance += 1
-                missed_contamination_rate.append(
-                    consignment_contamination_rate(consignment)
-                )
-                total_missed_contaminants += consignment.count_contaminated()
+                missed_contamination_rate.append(contamination_rate)
+                total_missed_contaminants += num_contaminated_items
             else:
-                intercepted_contamination_rate.append(
-                    consignment_contamination_rate(consignment)
-                )
-                total_intercepted_contaminants += consignment.count_contaminated()
+                intercepted_contamination_rate.append(contamination_rate)
+                total_intercepted_contaminants += num_contaminated_items
+
+    form280.flush()
 
     num_contaminated = num_consignments - success_rates.ok
     if num_contaminated:
@@ -245,6 +251,39 @@ def simulation(
     return simulation_results
 
 
+def _simulation_with_parameters(parameters):
+    """Call the simulation function with parameters from a dictionary"""
+    return simulation(**parameters)
+
+
+def _run_simulations(parameters, num_simulations, seed, processes):
+    """Run simulations with parameters from a dictionary and return their results
+
+    Simulation i runs with *seed* + i. When running in parallel (*processes*
+    other than 1), only the last simulation writes the F280 records.
+    """
+    parallel = processes != 1
+    simulation_parameters = [
+        {
+            **parameters,
+            "seed": seed + i if seed is not None else None,
+            "output_f280_file": (
+                parameters["output_f280_file"]
+                if not parallel or i == num_simulations - 1
+                else None
+            ),
+        }
+        for i in range(num_simulations)
+    ]
+    if parallel:
+        # Without a seed, each worker process needs its own random state.
+        with multiprocessing.Pool(
+            processes, initializer=random_seed, initargs=(None,)
+        ) as pool:
+            return pool.map(_simulation_with_parameters, simulation_parameters)
+    return map(_simulation_with_parameters, simulation_parameters)
+
+
 def run_simulation(
     config,
     num_simulations,
@@ -254,11 +293,17 @@ def run_simulation(
     verbose=False,
     pretty=None,
     detailed=False,
+    processes=1,
 ):
     """Run the simulation function specified number of times
 
     See :func:`simulation` function for explanation of parameters.
 
+    Simulations run in parallel in separate processes when *processes* is
+    other than 1 (*None* means number of CPUs). In that case, only the last
+    simulation writes the F280 records (as this is the one which would be
+    kept when running sequentially).
+
     Returns averages computed from the individual simulation runs otherwise
     it relies on :func:`simulation` function to do the hard work.
     """
@@ -292,16 +337,21 @@ def run_simulation(
         total_missed_contaminants=0,
     )
 
-    for i in range(num_simulations):
-        result = simulation(
-            config=config,
-            num_consignments=num_consignments,
-            seed=seed + i if seed is not None else None,
-            output_f280_file=output_f280_file,
-            verbose=verbose,
-            pretty=pretty,
-            detailed=detailed,
-        )
+    results = _run_simulations(
+        {
+            "config": config,
+            "num_consignments": num_consignments,
+            "output_f280_file": output_f280_file,
+            "verbose": verbose,
+            "pretty": pretty,
+            "detailed": detailed,
+        },
+        num_simulations=num_simulations,
+        seed=seed,
+        processes=processes,
+    )
+
+    for i, result in enumerate(results):
         if detailed and i == 0:
             # details are from first run of simulation only
             details = result.details
@@ -20,8 +20,8 @@
 .. codeauthor:: Vaclav Petras <wenzeslaus gmail com>
 """
 
-import functools
 import random
+from operator import attrgetter
 
 from .inputs import load_cfrp_schedule, load_skip_lot_consignment_records
 
@@ -43,8 +43,8 @@ def get_inspection_needed_function(config):
             if name == "fixed_skip_lot":
                 return FixedComplianceLevelSkipLot(config["release_programs"][name])
             elif name == "naive_cfrp":
-                return functools.partial(
-                    naive_cfrp, config["release_programs"][name], name
+                return NaiveCutFlowerReleaseProgram(
+                    config["release_programs"][name], name
                 )
             else:
                 raise RuntimeError(f"Unknown release program: {name}")
@@ -69,16 +69,44 @@ def naive_cfrp(config, name, consignment, date):
 
     Returns tuple with boolean and string. The boolean requests inspection and the
     string is name of the program provided as parameter.
+
+    See :class:`NaiveCutFlowerReleaseProgram` which processes the configuration
+    only once for repeated decisions.
+    """
+    return NaiveCutFlowerReleaseProgram(config, name)(consignment, date)
+
+
+class NaiveCutFlowerReleaseProgram:
+    """Naive Cut Flower Release Program
+
+    Objects can be called as functions to decide if consignments should be
+    inspected. The configuration is processed only once during initialization.
     """
-    flower = consignment.flower
-    cfrp = config["flowers"]
-    max_boxes = config["max_boxes"]
-    # we have flowers in the CFRP, flower is in CFRP, and not too big consignment
-    if cfrp and flower in cfrp and consignment.num_boxes <= max_boxes:
-        if is_naive_flower_of_the_day(cfrp, flower, date):
-            return True, name  # is FotD, inspect
-        return False, name  # not FotD, release
-    return True, None  # not in CFRP or large, inspect
+
+    def __init__(self, config, name):
+        self._program_name = name
+        self._flowers = list(config["flowers"] or [])
+        self._flowers_in_program = set(self._flowers)
+        self._max_boxes = config["max_boxes"]
+
+    def __call__(self, consignment, date):
+        """Decide if the consignment should be inspected based on naive CFRP
+
+        Returns tuple with boolean and string. The boolean requests inspection and
+        the string is name of the program.
+        """
+        flower = consignment.flower
+        # flower is in CFRP and not too big consignment
+        if (
+            flower in self._flowers_in_program
+            and consignment.num_boxes <= self._max_boxes
+        ):
+            # inspect if FotD, release otherwise
+            return (
+                is_naive_flower_of_the_day(self._flowers, flower, date),
+                self._program_name,
+            )
+        return True, None  # not in CFRP or large, inspect
 
 
 class CutFlowerReleaseProgram:
@@ -91,14 +119,21 @@ class CutFlowerReleaseProgram:
 
     def __init__(self, config, schedule=None):
         self._program_name = config.get("name", "cfrp")
-        if schedule:
-            self._schedule = schedule
-        else:
+        if not schedule:
             schedule_config = config["schedule"]
-            self._schedule = load_cfrp_schedule(
+            schedule = load_cfrp_schedule(
                 schedule_config["file_name"],
                 date_format=schedule_config.get("date_format"),
             )
+        # Each scheduled day is one flower-origin-date record, so checking if
+        # the flower is of the day (FotD) is a single set lookup.
+        self._scheduled = frozenset(
+            (flower, origin, date)
+            for (flower, origin), dates in schedule.items()
+            for date in dates
+        )
+        # Combos without any dates are not in the program.
+        self._combos = frozenset(combo for combo, dates in schedule.items() if dates)
         self._ports = config.get("ports")
 
     def __call__(self, consignment, date):
@@ -112,19 +147,33 @@ class CutFlowerReleaseProgram:
         # Check if we are in a participating port.
         if self._ports and consignment.port not in self._ports:
             return True, None  # inspect, not in CFRP
+        flower = consignment.flower
+        origin = consignment.origin
+        if (flower, origin, date) in self._scheduled:
+            return True, self._program_name  # inspect, is FotD
         # Look up flower-origin combo is in the program.
-        dates_for_flower = self._schedule.get((consignment.flower, consignment.origin))
-        if dates_for_flower:
-            if date in dates_for_flower:
-                return True, self._program_name  # inspect, is FotD
+        if (flower, origin) in self._combos:
             return False, self._program_name  # release, in CFRP, but not FotD
         return True, None  # inspect, not in CFRP
 
 
+def tuple_attrgetter(names):
+    """Return function which gets the named attributes of an object as a tuple
+
+    Unlike operator.attrgetter, the result is a tuple for any number of names.
+    """
+    if not names:
+        return lambda obj: ()
+    if len(names) == 1:
+        get_one = attrgetter(names[0])
+        return lambda obj: (get_one(obj),)
+    return attrgetter(*names)
+
+
 class FixedComplianceLevelSkipLot:
     """A skip lot program which uses predefined compliance levels for consignments"""
 
-    def __init__(self, config, consignment_records=None):
+    def __init__(self, config, consignment_records=None, rng=None):
         """Creates internal consignment records, levels, and defaults.
 
         Consignment records are read from config under key 'consignment_records',
@@ -132,10 +181,16 @@ class FixedComplianceLevelSkipLot:
         or directly from the consignment_records parameter.
         While the records in configuration are in a list, the parameter is a dictionary
         with consignment property values as keys and compliance level names as values.
+
+        Inspection decisions use *rng* which can be a random.Random instance.
+        The global state of the random module (seeded by
+        :func:`popsborder.simulation.random_seed`) is used by default.
         """
+        self._rng = random if rng is None else rng
         self._program_name = config.get("name", "fixed_skip_lot")
         self._tracked_properties = config.get("track")
         self._default_level = config.get("default_level")
+        self._get_key = tuple_attrgetter(self._tracked_properties)
 
         levels = config.get("levels")
         self._levels = {}
@@ -173,20 +228,16 @@ class FixedComplianceLevelSkipLot:
 
         The level is selected based on consignment properties.
         """
-        key = []
-        for name in self._tracked_properties:
-            try:
-                property_value = getattr(consignment, name)
-            except AttributeError as error:
-                raise ValueError(
-                    f"Consignment does not have a property '{name}'"
-                ) from error
-            key.append(property_value)
-        key = tuple(key)
-        if key not in self._consignment_records:
-            self._consignment_records[key] = self._default_level
-            return self._default_level
-        return self._consignment_records[key]
+        try:
+            key = self._get_key(consignment)
+        except AttributeError as error:
+            for name in self._tracked_properties:
+                if not hasattr(consignment, name):
+                    raise ValueError(
+                        f"Consignment does not have a property '{name}'"
+                    ) from error
+            raise
+        return self._consignment_records.setdefault(key, self._default_level)
 
     def sampling_fraction_for_level(self, level):
         """Get ratio of items or boxes to inspect associated with a compliance level"""
@@ -201,6 +252,6 @@ class FixedComplianceLevelSkipLot:
         """
         level = self.compliance_level_for_consignment(consignment)
         sampling_fraction = self.sampling_fraction_for_level(level)
-        if random.random() <= sampling_fraction:
+        if self._rng.random() <= sampling_fraction:
             return True, self._program_name
         return False, self._program_name
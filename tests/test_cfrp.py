@@ -2,6 +2,8 @@
 
 import datetime
 
+import pytest
+
 from popsborder.consignments import Consignment, get_consignment_generator
 from popsborder.inputs import load_cfrp_schedule, load_configuration_yaml_from_text
 from popsborder.simulation import random_seed
@@ -75,17 +77,23 @@ def simple_consignment(flower, origin, date, port="FL Miami Air CBP"):
         items_per_box=0,
         num_boxes=0,
         date=date,
-        boxes=[],
         pathway="airport",
         port=port,
         origin=origin,
     )
 
 
-def test_cfrp(tmp_path):
-    """Check that CFRP program is accepted and gives expected results"""
-    schedule_file = tmp_path / "schedule_file.csv"
-    schedule_file.write_text(SCHEDULE_CSV_TEXT)
+@pytest.fixture(scope="module")
+def schedule_file(tmp_path_factory):
+    """Schedule file which is not modified by the tests"""
+    path = tmp_path_factory.mktemp("cfrp") / "schedule_file.csv"
+    path.write_text(SCHEDULE_CSV_TEXT)
+    return path
+
+
+@pytest.fixture(scope="module")
+def cfrp_simulation_parts(schedule_file):
+    """Consignment generator and inspection function using CFRP from a file"""
     consignment_generator = get_consignment_generator(
         load_configuration_yaml_from_text(BASE_CONSIGNMENT_CONFIG)
     )
@@ -94,24 +102,28 @@ def test_cfrp(tmp_path):
             CFRP_CONFIG.format(schedule_file=schedule_file)
         )
     )
+    return consignment_generator, is_needed_function
+
+
+# We run with different, but fixed seeds so we can know which seed fails.
+@pytest.mark.parametrize("seed", range(10))
+def test_cfrp(cfrp_simulation_parts, seed):
+    """Check that CFRP program is accepted and gives expected results"""
+    consignment_generator, is_needed_function = cfrp_simulation_parts
     # The following assumes what is the default returned by the get function,
     # i.e., it relies on its internals, not the interface.
     # pylint: disable=comparison-with-callable
     assert is_needed_function != inspect_always
-    for seed in range(10):
-        # We run with different, but fixed seeded so we can know which seed fails.
-        random_seed(seed)
-        consignment = consignment_generator.generate_consignment()
-        inspect, program = is_needed_function(consignment, consignment.date)
-        assert isinstance(inspect, bool)
-        # Testing custom name
-        assert program == "CFRP" or program is None
+    random_seed(seed)
+    consignment = consignment_generator.generate_consignment()
+    inspect, program = is_needed_function(consignment, consignment.date)
+    assert isinstance(inspect, bool)
+    # Testing custom name
+    assert program == "CFRP" or program is None
 
 
-def test_load_cfrp_schedule(tmp_path):
+def test_load_cfrp_schedule(schedule_file):
     """Check that schedule loads from a CSV file with custom date format"""
-    schedule_file = tmp_path / "schedule_file.csv"
-    schedule_file.write_text(SCHEDULE_CSV_TEXT)
     schedule = load_cfrp_schedule(schedule_file, date_format="%Y_%m_%d")
 
     # Keys were loaded.
@@ -129,6 +141,22 @@ def test_load_cfrp_schedule(tmp_path):
     }
 
 
+def test_load_cfrp_schedule_keeps_names_as_text(tmp_path):
+    """Check that names which look like numbers or missing values stay as text"""
+    schedule_file = tmp_path / "schedule_file.csv"
+    schedule_file.write_text(
+        "Date,Commodity,Origin_NM,Note\n"
+        "2020-01-02,1,NA,a\n"
+        "2020-01-02,1,NA,b\n"
+        "2020-01-03,Rosa,NA,\n"
+    )
+    schedule = load_cfrp_schedule(schedule_file)
+    assert schedule == {
+        ("1", "NA"): {datetime.date(2020, 1, 2)},
+        ("Rosa", "NA"): {datetime.date(2020, 1, 3)},
+    }
+
+
 def test_cfrp_inspect_in_program():
     """Check inspection is requested for flower of the day"""
     cfrp = CutFlowerReleaseProgram({}, schedule=SCHEDULE)
@@ -238,3 +266,22 @@ def test_cfrp_port_not_in_program_but_flower_country_in_program():
     inspect, program_name = cfrp(consignment, consignment.date)
     assert inspect
     assert program_name is None
+
+
+def test_load_cfrp_schedule_modified_file(tmp_path):
+    """Check that schedule reloads when the file changes"""
+    schedule_file = tmp_path / "schedule_file.csv"
+    schedule_file.write_text(SCHEDULE_CSV_TEXT)
+    schedule = load_cfrp_schedule(schedule_file, date_format="%Y_%m_%d")
+    assert ("Sedum", "Netherlands") in schedule
+    # Modifying the returned schedule does not influence other calls.
+    schedule[("Liatris", "Ecuador")].clear()
+    schedule = load_cfrp_schedule(schedule_file, date_format="%Y_%m_%d")
+    assert len(schedule[("Liatris", "Ecuador")]) == 2
+    schedule_file.write_text(
+        "\n".join(
+            line for line in SCHEDULE_CSV_TEXT.splitlines() if "Sedum" not in line
+        )
+    )
+    schedule = load_cfrp_schedule(schedule_file, date_format="%Y_%m_%d")
+    assert ("Sedum", "Netherlands") not in schedule
@@ -1,6 +1,13 @@
+import contextlib
+import io
+import os
 import subprocess
 import sys
 
+import pytest
+
+from popsborder.app import main
+
 CONFIG = """\
 consignment:
   generation_method: parameter_based
@@ -50,30 +57,57 @@ inspection:
 """
 
 
-def key_to_option(key):
-    return "--{}".format(key.replace("_", "-"))
-
-
 def dict_to_options(dictionary):
-    options = []
-    for key, value in dictionary.items():
-        options.append(key_to_option(key))
-        options.append("{}".format(value))
-    return options
+    return [
+        text
+        for key, value in dictionary.items()
+        for text in ("--{}".format(key.replace("_", "-")), "{}".format(value))
+    ]
 
 
 def run_cli(**kwargs):
+    # Output is decoded at once, so make sure it is in the expected encoding.
+    env = dict(os.environ, PYTHONIOENCODING="utf-8", PYTHONDONTWRITEBYTECODE="1")
     # Using unpacking into a list literal from Python 3.5
-    return subprocess.check_output(
+    output = subprocess.run(
         [sys.executable, "-m", "popsborder", *dict_to_options(kwargs)],
-        universal_newlines=True,
-    )
+        capture_output=True,
+        check=True,
+        env=env,
+    ).stdout
+    return output.decode("utf-8", "replace")
+
+
+def run_main(**kwargs):
+    """Run the command line interface in the current process and return output"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        main(dict_to_options(kwargs))
+    return output.getvalue()
 
 
-def test_gives_result(tmp_path):
-    config = tmp_path / "config.yml"
+@pytest.fixture(scope="module")
+def config_file(tmp_path_factory):
+    """Configuration file shared by all tests in this module"""
+    config = tmp_path_factory.mktemp("cli") / "config.yml"
     config.write_text(CONFIG)
-    for seed in range(30):
-        assert "slipped" in run_cli(
-            num_consignments=10, config_file=str(config), seed=seed
-        )
+    return str(config)
+
+
+def test_gives_result(config_file):
+    assert "slipped" in run_cli(num_consignments=10, config_file=config_file, seed=0)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_gives_result_in_process(config_file, seed):
+    assert "slipped" in run_main(
+        num_consignments=10, config_file=config_file, seed=seed
+    )
+
+
+@pytest.mark.parametrize("processes", [0, -1, "many"])
+def test_invalid_processes_rejected(config_file, capsys, processes):
+    """Check that number of processes needs to be a positive integer"""
+    with pytest.raises(SystemExit):
+        run_main(num_consignments=10, config_file=config_file, processes=processes)
+    assert "--processes" in capsys.readouterr().err
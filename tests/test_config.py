@@ -1,10 +1,16 @@
 """Test configuration loading functions"""
 
+from pathlib import Path
+
 import pytest
 
 from popsborder.inputs import (
+    _load_configuration_file_cached,
+    _load_xlsx_rows_cached,
     dict_config_to_table,
+    load_config_xlsx,
     load_configuration,
+    load_configuration_yaml_from_text,
     print_table_config,
 )
 
@@ -125,3 +131,54 @@ def test_include_files_list(datadir):
         "origin": "Colombia",
         "contamination": {"arrangement": "random"},
     }
+
+
+def test_loaded_configuration_is_independent_copy(tmp_path):
+    """Check that configurations loaded from the same file can be modified"""
+    config_file = tmp_path / "config.yml"
+    config_file.write_text("inspection:\n  unit: boxes\n")
+    config = load_configuration(config_file)
+    config["inspection"]["unit"] = "items"
+    assert load_configuration(config_file) == {"inspection": {"unit": "boxes"}}
+    config_file.write_text("inspection:\n  unit: items\n  min_boxes: 1\n")
+    assert load_configuration(config_file) == {
+        "inspection": {"unit": "items", "min_boxes": 1}
+    }
+
+
+def test_configuration_file_cached_once_for_different_paths(tmp_path, monkeypatch):
+    """Check that relative and absolute paths to one file share the cache"""
+    (tmp_path / "subdir").mkdir()
+    config_file = tmp_path / "config.yml"
+    config_file.write_text("inspection:\n  unit: boxes\n")
+    monkeypatch.chdir(tmp_path / "subdir")
+    load_configuration(config_file)
+    hits = _load_configuration_file_cached.cache_info().hits
+    assert load_configuration("../config.yml") == {"inspection": {"unit": "boxes"}}
+    assert load_configuration(Path("..") / "subdir" / ".." / "config.yml")
+    assert _load_configuration_file_cached.cache_info().hits == hits + 2
+
+
+def test_xlsx_columns_read_from_one_parse(datadir):
+    """Check that different value columns of one XLSX file are read from cache"""
+    filename = datadir / "large_config.xlsx"
+    config_d = load_config_xlsx(filename, value_column="D")
+    hits = _load_xlsx_rows_cached.cache_info().hits
+    config_e = load_config_xlsx(filename, value_column="E")
+    assert _load_xlsx_rows_cached.cache_info().hits == hits + 1
+    assert config_e == load_configuration(f"{filename}::value_column=E")
+    assert config_d != config_e
+
+
+def test_dict_config_to_table_keys():
+    """Check that nested keys are joined by slashes"""
+    config = {"a": {"b": {"c": 1}, "d": [1, 2]}, "e": "text"}
+    assert dict_config_to_table(config) == {"a/b/c": 1, "a/d": [1, 2], "e": "text"}
+
+
+def test_configuration_from_text_is_independent_copy():
+    """Check that configurations parsed from the same text can be modified"""
+    text = "inspection:\n  unit: boxes\n"
+    config = load_configuration_yaml_from_text(text)
+    config["inspection"]["unit"] = "items"
+    assert load_configuration_yaml_from_text(text) == {"inspection": {"unit": "boxes"}}
@@ -2,9 +2,16 @@
 
 import datetime
 
+import numpy as np
 import pytest
 
-from popsborder.consignments import Consignment
+from popsborder.consignments import (
+    Consignment,
+    ConsignmentGenerator,
+    get_consignment_generator,
+)
+from popsborder.inputs import load_configuration_yaml_from_text
+from popsborder.simulation import random_seed
 
 
 def simple_consignment(flower="Tulipa", origin="Netherlands", date=None):
@@ -16,7 +23,6 @@ def simple_consignment(flower="Tulipa", origin="Netherlands", date=None):
         items_per_box=0,
         num_boxes=0,
         date=date,
-        boxes=[],
         pathway="airport",
         port="FL Miami Air CBP",
         origin=origin,
@@ -78,3 +84,98 @@ def test_consignment_date_comapares(date):
     """Check that consignment date attribute compares with date objects"""
     consignment = simple_consignment(date=date)
     assert consignment.date > datetime.date(2022, 9, 28)
+
+
+def test_consignment_box_contaminated_partial_last_box():
+    """Check that contaminated boxes are identified including a partial last box"""
+    items = np.array([0, 0, 0, 1, 0, 0, 0, 1], dtype=np.int64)
+    consignment = Consignment(
+        flower="Tulipa",
+        num_items=8,
+        items=items,
+        items_per_box=3,
+        num_boxes=3,
+        date=None,
+        pathway="airport",
+        port="FL Miami Air CBP",
+        origin="Netherlands",
+    )
+    assert consignment.box_contaminated.tolist() == [False, True, True]
+    assert consignment.box_items(2).tolist() == [0, 1]
+    consignment.box_items(0).fill(1)
+    assert consignment.box_contaminated.tolist() == [True, True, True]
+    assert consignment.item_in_box_to_item_index(2, 1) == 7
+
+
+CONSIGNMENT_CONFIG = """\
+consignment:
+  generation_method: parameter_based
+  items_per_box:
+    default: 10
+  parameter_based:
+    boxes:
+      min: 2
+      max: 5
+    origins:
+      - Netherlands
+      - Mexico
+    flowers:
+      - Hyacinthus
+      - Rosa
+    ports:
+      - NY JFK CBP
+      - FL Miami Air CBP
+"""
+
+
+def test_generate_consignments_in_batch():
+    """Check that consignments generated at once follow the parameters"""
+    config = load_configuration_yaml_from_text(CONSIGNMENT_CONFIG)
+    parameters = config["consignment"]["parameter_based"]
+    consignment_generator = get_consignment_generator(config)
+    for seed in range(10):
+        random_seed(seed)
+        consignments = list(consignment_generator.generate_consignments(20))
+        assert len(consignments) == 20
+        for consignment in consignments:
+            assert 2 <= consignment.num_boxes <= 5
+            assert consignment.num_items == 10 * consignment.num_boxes
+            assert consignment.items.shape == (consignment.num_items,)
+            assert not np.any(consignment.items)
+            assert consignment.flower in parameters["flowers"]
+            assert consignment.origin in parameters["origins"]
+            assert consignment.port in parameters["ports"]
+
+
+def test_generate_consignments_reusing_items():
+    """Check that reused items are cleared for each new consignment"""
+    config = load_configuration_yaml_from_text(CONSIGNMENT_CONFIG)
+    consignment_generator = get_consignment_generator(config)
+    random_seed(1)
+    for consignment in consignment_generator.generate_consignments(
+        20, reuse_items=True
+    ):
+        assert consignment.items.shape == (consignment.num_items,)
+        assert not np.any(consignment.items)
+        # Contaminate the whole consignment to check that the next one is clean.
+        consignment.items.fill(1)
+
+
+def test_generate_consignments_same_as_one_by_one():
+    """Check that batch and one-by-one generation give the same consignments"""
+    config = load_configuration_yaml_from_text(CONSIGNMENT_CONFIG)
+    random_seed(2)
+    batch = list(get_consignment_generator(config).generate_consignments(20))
+    random_seed(2)
+    consignment_generator = get_consignment_generator(config)
+    one_by_one = [consignment_generator.generate_consignment() for unused in batch]
+    properties = ["flower", "origin", "port", "num_boxes", "date"]
+    assert [[c[name] for name in properties] for c in batch] == [
+        [c[name] for name in properties] for c in one_by_one
+    ]
+
+
+def test_consignment_generator_is_abstract():
+    """Check that a generator needs to implement single consignment generation"""
+    with pytest.raises(TypeError):
+        ConsignmentGenerator()  # pylint: disable=abstract-class-instantiated
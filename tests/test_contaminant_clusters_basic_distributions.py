@@ -1,8 +1,9 @@
 import datetime
 
 import numpy as np
+import pytest
 
-from popsborder.consignments import Box, Consignment
+from popsborder.consignments import Consignment
 from popsborder.contamination import add_contaminant_clusters
 from popsborder.inputs import load_configuration_yaml_from_text
 from popsborder.simulation import random_seed
@@ -37,7 +38,7 @@ contamination:
 
 def get_consignment(num_items):
     """Get basic consignment with given number of items all in one box"""
-    items = np.zeros(num_items, dtype=int)
+    items = np.zeros(num_items, dtype=np.uint8)
     return Consignment(
         flower="Rosa",
         date=datetime.date(2018, 2, 15),
@@ -46,16 +47,27 @@ def get_consignment(num_items):
         num_items=num_items,
         items=items,
         num_boxes=1,
-        boxes=[Box(items)],
         items_per_box=num_items,
         pathway="air",
     )
 
 
-def test_continuous_clusters():
+@pytest.fixture(scope="module")
+def continuous_config():
+    """Contamination config for clusters with continuous distribution"""
+    return load_configuration_yaml_from_text(CONTINUOUS_CONFIG)["contamination"]
+
+
+@pytest.fixture(scope="module")
+def random_config():
+    """Contamination config for clusters with random distribution"""
+    return load_configuration_yaml_from_text(RANDOM_CONFIG)["contamination"]
+
+
+def test_continuous_clusters(continuous_config):
     """Test contamination rate of clustered arrangement with continuous distribution"""
     random_seed(42)
-    config = load_configuration_yaml_from_text(CONTINUOUS_CONFIG)["contamination"]
+    config = continuous_config
     num_items = 100
     consignment = get_consignment(num_items)
     add_contaminant_clusters(config, consignment)
@@ -64,13 +76,30 @@ def test_continuous_clusters():
     assert np.count_nonzero(consignment.items) == contaminated_items
 
 
-def test_random_clusters():
+def test_random_clusters(random_config):
     """Test contamination rate of clustered arrangement with random distribution"""
     random_seed(42)
-    config = load_configuration_yaml_from_text(RANDOM_CONFIG)["contamination"]
+    config = random_config
     num_items = 550
     consignment = get_consignment(num_items)
     add_contaminant_clusters(config, consignment)
     contamination_rate = 0.12
     contaminated_items = int(num_items * contamination_rate)
     assert np.count_nonzero(consignment.items) == contaminated_items
+
+
+def test_random_clusters_with_generator(random_config):
+    """Test that clusters placed using a seeded generator are reproducible
+
+    The global random state differs between the runs, so the placements match
+    only when the generator is used.
+    """
+    num_items = 550
+    consignments = [get_consignment(num_items) for unused in range(2)]
+    for global_seed, consignment in zip([1, 2], consignments):
+        random_seed(global_seed)
+        add_contaminant_clusters(
+            random_config, consignment, rng=np.random.default_rng(42)
+        )
+    assert np.array_equal(consignments[0].items, consignments[1].items)
+    assert np.count_nonzero(consignments[0].items) == int(num_items * 0.12)
@@ -2,14 +2,19 @@
 
 import datetime
 
+import numpy as np
 import pytest
 
 from popsborder.consignments import Consignment
 from popsborder.contamination import (
+    consignment_matches_selection_rule,
+    get_contaminant_function,
     get_contamination_config_for_consignment,
     get_contamination_rate,
+    rules_for_commodity_and_origin,
 )
 from popsborder.inputs import load_configuration_yaml_from_text
+from popsborder.simulation import random_seed
 
 CONFIG = """\
 contamination:
@@ -64,16 +69,24 @@ def simple_consignment(flower, origin, date=None):
         items_per_box=0,
         num_boxes=0,
         date=date,
-        boxes=[],
         pathway="airport",
         port="FL Miami Air CBP",
         origin=origin,
     )
 
 
-def test_consignment_matches_contamination_rule():
+@pytest.fixture(scope="module")
+def main_config():
+    """Configuration with consignment-specific contamination rules
+
+    Getting the contamination config for a consignment creates a copy,
+    so the configuration can be shared by the tests.
+    """
+    return load_configuration_yaml_from_text(CONFIG)
+
+
+def test_consignment_matches_contamination_rule(main_config):
     """Check that consignment is selected based on a rule"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Sedum", origin="Colombia")
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -81,9 +94,8 @@ def test_consignment_matches_contamination_rule():
     assert config == {"contamination_unit": "item", "arrangement": "random"}
 
 
-def test_consignment_with_no_contamination():
+def test_consignment_with_no_contamination(main_config):
     """Check that consignment is not selected based on a rule"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Rosa", origin="Colombia")
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -100,9 +112,8 @@ def test_consignment_with_no_contamination():
         datetime.date(2022, 10, 15),
     ],
 )
-def test_consignment_matches_contamination_rule_within_date_interval(date):
+def test_consignment_matches_contamination_rule_within_date_interval(main_config, date):
     """Check that consignment is selected based on a rule with start and end dates"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Tulipa", origin="Netherlands", date=date)
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -119,9 +130,10 @@ def test_consignment_matches_contamination_rule_within_date_interval(date):
         datetime.date(2021, 10, 1),
     ],
 )
-def test_consignment_matches_contamination_rule_outside_of_date_interval(date):
+def test_consignment_matches_contamination_rule_outside_of_date_interval(
+    main_config, date
+):
     """Check that consignment is not selected based on a rule with dates"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Tulipa", origin="Netherlands", date=date)
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -133,9 +145,8 @@ def test_consignment_matches_contamination_rule_outside_of_date_interval(date):
     "date",
     [datetime.date(2021, 1, 5), datetime.date(2022, 1, 5), datetime.date(2022, 4, 10)],
 )
-def test_consignment_matches_contamination_rule_before_end_date(date):
+def test_consignment_matches_contamination_rule_before_end_date(main_config, date):
     """Check that consignment is selected based on a rule with end date"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Gerbera", origin="Netherlands", date=date)
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -151,9 +162,8 @@ def test_consignment_matches_contamination_rule_before_end_date(date):
         datetime.date(2023, 10, 5),
     ],
 )
-def test_consignment_matches_contamination_rule_after_start_date(date):
+def test_consignment_matches_contamination_rule_after_start_date(main_config, date):
     """Check that consignment is selected based on a rule with start date"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Gerbera", origin="Netherlands", date=date)
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -165,9 +175,8 @@ def test_consignment_matches_contamination_rule_after_start_date(date):
     "date",
     [datetime.date(2022, 4, 11), datetime.date(2022, 5, 5), datetime.date(2022, 8, 19)],
 )
-def test_consignment_between_two_date_rules(date):
+def test_consignment_between_two_date_rules(main_config, date):
     """Check that consignment is not selected in presence of start and end date rules"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Gerbera", origin="Netherlands", date=date)
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -175,9 +184,39 @@ def test_consignment_between_two_date_rules(date):
     assert config is None
 
 
-def test_contamination_config_for_consignment_no_default():
+@pytest.mark.parametrize(
+    "date, selected",
+    [
+        (datetime.date(2022, 9, 28), False),
+        (datetime.date(2022, 9, 29), True),
+        (datetime.date(2022, 10, 15), True),
+        (datetime.date(2022, 10, 16), False),
+    ],
+)
+def test_consignment_matches_rule_with_dates_as_text(date, selected):
+    """Check that dates in a rule can be text (as from JSON or tables)"""
+    rule = {"commodity": "Tulipa", "start_date": "2022-09-29", "end_date": "2022-10-15"}
+    consignment = simple_consignment(flower="Tulipa", origin="Netherlands", date=date)
+    assert consignment_matches_selection_rule(rule, consignment) == selected
+
+
+@pytest.mark.parametrize("flower", ["Tulipa", "Gerbera", "Rose", "Sedum", "Rosa"])
+@pytest.mark.parametrize("origin", ["Netherlands", "Mexico", "Colombia"])
+def test_contamination_config_with_rules_for_commodity_and_origin(
+    main_config, flower, origin
+):
+    """Check that only rules for commodity and origin give the same config"""
+    config = main_config["contamination"]
+    rules = rules_for_commodity_and_origin(config["consignments"], flower, origin)
+    for date in [datetime.date(2022, 1, 5), datetime.date(2022, 10, 1)]:
+        consignment = simple_consignment(flower=flower, origin=origin, date=date)
+        assert get_contamination_config_for_consignment(
+            config, consignment, rules=rules
+        ) == get_contamination_config_for_consignment(config, consignment)
+
+
+def test_contamination_config_for_consignment_no_default(main_config):
     """Check that consignment has only its unique config (defaults not requested)"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Liatris", origin="Netherlands")
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -185,9 +224,8 @@ def test_contamination_config_for_consignment_no_default():
     assert config == {"arrangement": "random_box"}
 
 
-def test_contamination_config_for_consignment_implicit_default():
+def test_contamination_config_for_consignment_implicit_default(main_config):
     """Check that consignment inherits the top-level config"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Hyacinthus", origin="Israel")
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -195,9 +233,8 @@ def test_contamination_config_for_consignment_implicit_default():
     assert config == {"contamination_unit": "item", "arrangement": "random"}
 
 
-def test_contamination_config_for_consignment_no_default_explicitly():
+def test_contamination_config_for_consignment_no_default_explicitly(main_config):
     """Check that consignment has only its unique config (defaults disabled)"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Rose", origin="Netherlands")
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -205,9 +242,8 @@ def test_contamination_config_for_consignment_no_default_explicitly():
     assert config == {"contamination_unit": "box"}
 
 
-def test_contamination_config_for_consignment_with_default():
+def test_contamination_config_for_consignment_with_default(main_config):
     """Check that consignment has has combination of defaults and its own config"""
-    main_config = load_configuration_yaml_from_text(CONFIG)
     consignment = simple_consignment(flower="Rose", origin="Mexico")
     config = get_contamination_config_for_consignment(
         main_config["contamination"], consignment
@@ -241,3 +277,44 @@ def test_contamination_rate_dict_config(config):
     rate = get_contamination_rate(config["contamination"]["contamination_rate"])
     assert rate >= 0
     assert rate <= 1
+
+
+RANDOM_BOX_CONFIG = """\
+contamination:
+  arrangement: random_box
+  contamination_rate:
+    distribution: fixed_value
+    value: 0.1
+  random_box:
+    probability: 0
+    ratio: 0.5
+"""
+
+
+@pytest.mark.parametrize(
+    "probability, ratio, contaminated", [(0, 0.5, False), (1, 0, False), (1, 1, True)]
+)
+def test_random_box_contamination_limits(probability, ratio, contaminated):
+    """Check random box contamination with extreme probability and ratio values"""
+    config = load_configuration_yaml_from_text(RANDOM_BOX_CONFIG)
+    config["contamination"]["random_box"]["probability"] = probability
+    config["contamination"]["random_box"]["ratio"] = ratio
+    add_contaminant = get_contaminant_function(config)
+    for seed in range(5):
+        random_seed(seed)
+        consignment = Consignment(
+            flower="Rosa",
+            num_items=40,
+            items=np.zeros(40, dtype=np.uint8),
+            items_per_box=10,
+            num_boxes=4,
+            date=None,
+            pathway="airport",
+            port="FL Miami Air CBP",
+            origin="Mexico",
+        )
+        add_contaminant(consignment)
+        if contaminated:
+            assert np.all(consignment.items)
+        else:
+            assert not np.any(consignment.items)
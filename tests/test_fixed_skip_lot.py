@@ -1,5 +1,7 @@
 """Test fixed skip lot functionality"""
 
+import random
+
 import pytest
 
 from popsborder.consignments import Consignment, get_consignment_generator
@@ -81,33 +83,56 @@ def simple_consignment(flower, origin, date=None, port="FL Miami Air CBP"):
         items_per_box=0,
         num_boxes=0,
         date=date,
-        boxes=[],
         pathway="airport",
         port=port,
         origin=origin,
     )
 
 
-def test_fixed_skip_lot():
-    """Check that fixed skip lot program is accepted and gives expected results"""
+@pytest.fixture(scope="module")
+def skip_lot_config():
+    """Configuration of the fixed skip lot program (the program only reads it)"""
+    config = load_configuration_yaml_from_text(CONFIG)
+    return config["release_programs"]["fixed_skip_lot"]
+
+
+@pytest.fixture(scope="module")
+def program(skip_lot_config):
+    """Fixed skip lot program shared by tests
+
+    The program only fills in default levels for unknown consignments,
+    so it gives the same results for each test.
+    """
+    return FixedComplianceLevelSkipLot(skip_lot_config)
+
+
+@pytest.fixture(scope="module")
+def skip_lot_simulation_parts():
+    """Consignment generator and inspection function using fixed skip lot"""
     consignment_generator = get_consignment_generator(
         load_configuration_yaml_from_text(BASE_CONSIGNMENT_CONFIG)
     )
     is_needed_function = get_inspection_needed_function(
         load_configuration_yaml_from_text(CONFIG)
     )
+    return consignment_generator, is_needed_function
+
+
+# We run with different, but fixed seeds so we can know which seed fails.
+@pytest.mark.parametrize("seed", range(10))
+def test_fixed_skip_lot(skip_lot_simulation_parts, seed):
+    """Check that fixed skip lot program is accepted and gives expected results"""
+    consignment_generator, is_needed_function = skip_lot_simulation_parts
     # The following assumes what is the default returned by the get function,
     # i.e., it relies on its internals, not the interface.
     # pylint: disable=comparison-with-callable
     assert is_needed_function != inspect_always
-    for seed in range(10):
-        # We run with different, but fixed seeded so we can know which seed fails.
-        random_seed(seed)
-        consignment = consignment_generator.generate_consignment()
-        inspect, program = is_needed_function(consignment, consignment.date)
-        assert isinstance(inspect, bool)
-        # Testing custom name (program name should be always present for skip lot)
-        assert program == "Skip Lot"
+    random_seed(seed)
+    consignment = consignment_generator.generate_consignment()
+    inspect, program = is_needed_function(consignment, consignment.date)
+    assert isinstance(inspect, bool)
+    # Testing custom name (program name should be always present for skip lot)
+    assert program == "Skip Lot"
 
 
 def test_load_consignment_records(tmp_path):
@@ -120,29 +145,37 @@ def test_load_consignment_records(tmp_path):
     assert records == {("Netherlands", "Hyacinthus"): 2, ("Mexico", "Gerbera"): 3}
 
 
-def test_sometimes_inspect_in_program():
+def test_sometimes_inspect_in_program(skip_lot_config):
     """Inspection is requested at least sometimes when consignment is in the program"""
-    program = FixedComplianceLevelSkipLot(
-        load_configuration_yaml_from_text(CONFIG)["release_programs"]["fixed_skip_lot"]
-    )
     consignment = simple_consignment(flower="Hyacinthus", origin="Netherlands")
-    inspected = 0
-    for seed in range(10):
-        random_seed(seed)
-        inspect, program_name = program(consignment, consignment.date)
-        inspected += int(inspect)
-        assert program_name == "Skip Lot"
-    assert inspected, "With the seeds, we expect at least one inspection to happen"
+    # One seed gives a fixed sequence of decisions for the repeated calls.
+    program = FixedComplianceLevelSkipLot(skip_lot_config, rng=random.Random(0))
+    decisions = [program(consignment, consignment.date) for unused_i in range(10)]
+    assert all(program_name == "Skip Lot" for unused, program_name in decisions)
+    inspected = sum(inspect for inspect, unused in decisions)
+    assert inspected, "With the seed, we expect at least one inspection to happen"
 
 
-def test_never_inspect_in_program():
+def test_same_decisions_with_same_generator(skip_lot_config):
+    """Programs with equally seeded generators make the same decisions"""
+    consignment = simple_consignment(flower="Hyacinthus", origin="Netherlands")
+    programs = [
+        FixedComplianceLevelSkipLot(skip_lot_config, rng=random.Random(seed))
+        for seed in (1, 1)
+    ]
+    decisions = [
+        [program(consignment, consignment.date) for unused_i in range(20)]
+        for program in programs
+    ]
+    assert decisions[0] == decisions[1]
+
+
+def test_never_inspect_in_program(program):
     """Inspection is not requested when consignment is in a zero inspections level"""
-    program = FixedComplianceLevelSkipLot(
-        load_configuration_yaml_from_text(CONFIG)["release_programs"]["fixed_skip_lot"]
-    )
     consignment = simple_consignment(flower="Gerbera", origin="Mexico")
-    for seed in range(10):
-        random_seed(seed)
+    # One seed gives a fixed sequence of decisions for the repeated calls.
+    random_seed(0)
+    for unused_i in range(10):
         inspect, program_name = program(consignment, consignment.date)
         assert (
             not inspect
@@ -150,39 +183,47 @@ def test_never_inspect_in_program():
         assert program_name == "Skip Lot"
 
 
-def test_inspect_not_in_program():
+def test_inspect_not_in_program(program):
     """Check inspection is requested when consignment is not in the program"""
-    program = FixedComplianceLevelSkipLot(
-        load_configuration_yaml_from_text(CONFIG)["release_programs"]["fixed_skip_lot"]
-    )
     consignment = simple_consignment(flower="Rosa", origin="Netherlands")
-    for seed in range(10):
-        random_seed(seed)
+    # One seed gives a fixed sequence of decisions for the repeated calls.
+    random_seed(0)
+    for unused_i in range(10):
         inspect, program_name = program(consignment, consignment.date)
         assert inspect
         assert program_name == "Skip Lot"
 
 
 @pytest.mark.parametrize(["level", "fraction"], [(1, 1), (2, 0.5), (3, 0)])
-def test_fraction(level, fraction):
+def test_fraction(program, level, fraction):
     """Correct fraction is returned for a level"""
-    program = FixedComplianceLevelSkipLot(
-        load_configuration_yaml_from_text(CONFIG)["release_programs"]["fixed_skip_lot"]
-    )
     assert program.sampling_fraction_for_level(level) == fraction
 
 
 @pytest.mark.parametrize(
-    ["consignment", "level"],
-    [
-        (simple_consignment(flower="Hyacinthus", origin="Netherlands"), 2),
-        (simple_consignment(flower="Gerbera", origin="Mexico"), 3),
-        (simple_consignment(flower="Rosa", origin="Israel"), 1),
-    ],
+    ["flower", "origin", "level"],
+    [("Hyacinthus", "Netherlands", 2), ("Gerbera", "Mexico", 3), ("Rosa", "Israel", 1)],
 )
-def test_level(consignment, level):
+def test_level(program, flower, origin, level):
     """Correct level is returned for a shipment"""
-    program = FixedComplianceLevelSkipLot(
-        load_configuration_yaml_from_text(CONFIG)["release_programs"]["fixed_skip_lot"]
-    )
+    consignment = simple_consignment(flower=flower, origin=origin)
     assert program.compliance_level_for_consignment(consignment) == level
+
+
+def test_level_for_one_tracked_property(skip_lot_config):
+    """Level is found when only one property is tracked"""
+    config = dict(skip_lot_config, track=["origin"])
+    config["consignment_records"] = [{"origin": "Mexico", "compliance_level": 3}]
+    program = FixedComplianceLevelSkipLot(config)
+    consignment = simple_consignment(flower="Rosa", origin="Mexico")
+    assert program.compliance_level_for_consignment(consignment) == 3
+
+
+def test_level_for_unknown_property(skip_lot_config):
+    """Tracking a property consignments do not have is reported"""
+    config = dict(skip_lot_config, track=["origin", "color"])
+    config["consignment_records"] = []
+    program = FixedComplianceLevelSkipLot(config)
+    consignment = simple_consignment(flower="Rosa", origin="Mexico")
+    with pytest.raises(ValueError, match="color"):
+        program.compliance_level_for_consignment(consignment)
@@ -58,8 +58,21 @@ def test_text_to_value_boolean_like_value_still_value(value, expected):
     print(new_value, type(new_value))
     assert new_value == expected
     # Integers and floats 0 and 1 actually compare True against booleans,
-    # so we need to check the type as well.
-    assert isinstance(new_value, type(expected))
-    # We are allow for inheritance in the type check, however
-    # the class bool inherits from int, so we need to check that it is not bool.
-    assert not isinstance(new_value, bool)
+    # so we need to check the type as well. The class bool inherits from int,
+    # so the type needs to be exactly the expected one.
+    assert type(new_value) is type(expected)
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("true ", True),
+        (" false", False),
+        ("true\n", True),
+        (" null ", None),
+        ("\tfalse\n", False),
+    ],
+)
+def test_text_to_value_padded_json_literals(text, expected):
+    """Check that JSON literals surrounded by whitespace are still decoded"""
+    assert text_to_value(text) is expected
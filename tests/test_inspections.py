@@ -0,0 +1,68 @@
+"""Test inspection of consignments"""
+
+import random
+
+import numpy as np
+
+from popsborder.consignments import Consignment
+from popsborder.inspections import (
+    count_contaminated_boxes,
+    inspect_first,
+    inspect_first_n,
+    inspect_one_random,
+    is_consignment_contaminated,
+)
+
+
+def consignment_with_items(items, items_per_box):
+    """Get consignment with given items and default values for the rest"""
+    items = np.array(items)
+    num_items = len(items)
+    return Consignment(
+        flower="Tulipa",
+        num_items=num_items,
+        items=items,
+        items_per_box=items_per_box,
+        num_boxes=-(-num_items // items_per_box),
+        date=None,
+        pathway="airport",
+        port="FL Miami Air CBP",
+        origin="Netherlands",
+    )
+
+
+def test_inspect_first_n_stops_at_first_contaminated_box():
+    """Check that inspection stops at the first contaminated box"""
+    consignment = consignment_with_items([0, 0, 0, 0, 1, 0, 0, 1], items_per_box=2)
+    assert inspect_first_n(4, consignment) == (False, 3)
+    assert inspect_first_n(2, consignment) == (True, 2)
+    # More boxes than in the consignment
+    assert inspect_first_n(10, consignment) == (False, 3)
+
+
+def test_inspect_first_n_clean_consignment():
+    """Check that all requested boxes are inspected when there is no contaminant"""
+    consignment = consignment_with_items([0, 0, 0, 0, 0], items_per_box=2)
+    assert inspect_first_n(10, consignment) == (True, 3)
+
+
+def test_count_contaminated_boxes():
+    """Check number of contaminated boxes and contamination status"""
+    consignment = consignment_with_items([1, 1, 0, 0, 0, 1, 0, 0, 1], items_per_box=2)
+    assert count_contaminated_boxes(consignment) == 3
+    assert is_consignment_contaminated(consignment)
+    consignment = consignment_with_items([0, 0, 0], items_per_box=2)
+    assert count_contaminated_boxes(consignment) == 0
+    assert not is_consignment_contaminated(consignment)
+
+
+def test_inspect_single_box():
+    """Check inspections which open only one box"""
+    consignment = consignment_with_items([0, 0, 1, 0, 0], items_per_box=2)
+    assert inspect_first(consignment) == (True, 1)
+    consignment.box_items(0)[1] = 1
+    assert inspect_first(consignment) == (False, 1)
+    consignment = consignment_with_items([1, 1, 1, 1, 1], items_per_box=2)
+    for seed in range(5):
+        random.seed(seed)
+        assert inspect_one_random(consignment) == (False, 1)
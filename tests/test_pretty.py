@@ -0,0 +1,18 @@
+"""Test pretty-printing of consignments"""
+
+import numpy as np
+
+from popsborder.outputs import pretty_content
+
+
+def test_pretty_content_default_signs():
+    """Check that items are replaced by flowers and bugs"""
+    text = pretty_content(np.array([0, 1, 0], dtype=np.uint8))
+    assert text == "\N{Black Florette} \N{Bug} \N{Black Florette}"
+
+
+def test_pretty_content_custom_signs():
+    """Check that signs and separator can be configured"""
+    config = {"flower": "o", "bug": "x", "spaces": False}
+    assert pretty_content([True, False, False, True], config=config) == "xoox"
+    assert pretty_content(np.array([], dtype=np.uint8), config=config) == ""
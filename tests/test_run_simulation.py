@@ -1,3 +1,5 @@
+import csv
+
 import pytest
 
 from popsborder.inputs import load_configuration_yaml_from_text
@@ -57,17 +59,21 @@ def test_simulation_runs():
 
     This should contain parameters which at one point failed the simulation.
     """
-    for seed in range(10):
-        run_simulation(
-            config=load_configuration_yaml_from_text(CONFIG),
-            num_simulations=1,
-            num_consignments=10,
-            seed=seed,
-        )
+    # Simulation i runs with seed + i, so this covers seeds 0 to 9.
+    run_simulation(
+        config=load_configuration_yaml_from_text(CONFIG),
+        num_simulations=10,
+        num_consignments=10,
+        seed=0,
+    )
 
 
+# We run with different, but fixed seeds so we can know which seed fails.
+# With one simulation, the bounds are checked for each seed separately,
+# not only for an average of several simulations.
+@pytest.mark.parametrize("seed", range(10))
 @pytest.mark.parametrize("num_simulations", [1, 2, 3, 15])
-def test_gives_reasonable_result(num_simulations):
+def test_gives_reasonable_result(num_simulations, seed):
     """Check that the result from the simulation is in the expected range"""
     num_consignments = 100
     # We modify the existing configuration rather than defining a completely
@@ -77,15 +83,66 @@ def test_gives_reasonable_result(num_simulations):
     config = load_configuration_yaml_from_text(CONFIG)
     config["consignment"]["parameter_based"]["boxes"]["min"] = min_boxes
     config["consignment"]["parameter_based"]["boxes"]["max"] = max_boxes
-    for seed in range(10):
-        result = run_simulation(
-            config=config, num_simulations=1, num_consignments=100, seed=seed
+    result = run_simulation(
+        config=config,
+        num_simulations=num_simulations,
+        num_consignments=num_consignments,
+        seed=seed,
+    )
+    test_min_boxes = min_boxes * num_consignments
+    test_max_boxes = max_boxes * num_consignments
+    assert test_min_boxes <= result.num_boxes <= test_max_boxes
+    percentages = {
+        name: getattr(result, name)
+        for name in (
+            "pct_boxes_opened_completion",
+            "pct_boxes_opened_detection",
+            "pct_items_inspected_completion",
+            "pct_items_inspected_detection",
+            "pct_contaminant_unreported_if_detection",
+        )
+    }
+    assert all(0 <= value <= 100 for value in percentages.values()), percentages
+
+
+def test_f280_output(tmp_path):
+    """Check that F280 records are written for all consignments"""
+    num_consignments = 20
+    output_file = tmp_path / "f280.csv"
+    run_simulation(
+        config=load_configuration_yaml_from_text(CONFIG),
+        num_simulations=1,
+        num_consignments=num_consignments,
+        seed=1,
+        output_f280_file=output_file,
+    )
+    with open(output_file) as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["REPORT_DT", "LOCATION", "ORIGIN_NM", "COMMODITY", "disposition"]
+    assert len(rows) == num_consignments + 1
+
+
+def test_parallel_same_as_sequential():
+    """Check that simulations in parallel give the same result as sequential ones"""
+    config = load_configuration_yaml_from_text(CONFIG)
+    sequential = run_simulation(
+        config=config, num_simulations=4, num_consignments=20, seed=42
+    )
+    parallel = run_simulation(
+        config=config, num_simulations=4, num_consignments=20, seed=42, processes=2
+    )
+    assert parallel == sequential
+
+
+def test_pretty_output_uses_current_terminal_width(monkeypatch, capsys):
+    """Check that each simulation with pretty output uses the current terminal width"""
+    config = load_configuration_yaml_from_text(CONFIG)
+    widths = []
+    for columns in [50, 70]:
+        monkeypatch.setenv("COLUMNS", str(columns))
+        run_simulation(
+            config=config, num_simulations=1, num_consignments=1, pretty="boxes_only"
         )
-        test_min_boxes = min_boxes * num_consignments
-        test_max_boxes = max_boxes * num_consignments
-        assert test_min_boxes <= result.num_boxes <= test_max_boxes
-        assert 0 <= result.pct_boxes_opened_completion <= 100
-        assert 0 <= result.pct_boxes_opened_detection <= 100
-        assert 0 <= result.pct_items_inspected_completion <= 100
-        assert 0 <= result.pct_items_inspected_detection <= 100
-        assert 0 <= result.pct_contaminant_unreported_if_detection <= 100
+        header = capsys.readouterr().out.splitlines()[0]
+        widths.append(len(header))
+    assert widths == [50, 70]
@@ -12,7 +12,7 @@ def test_scenarios(datadir, tmp_path):
         scenario_table=scenario_table,
         seed=42,
         num_simulations=2,
-        num_consignments=50,
+        num_consignments=10,
     )
     assert len(scenario_table) == len(results)
     save_scenario_result_to_table(
@@ -79,3 +79,35 @@ def test_scenarios_with_xlsx(datadir):
         num_consignments=5,
     )
     assert len(scenario_table) == len(results)
+
+
+def test_scenario_table_is_independent_copy(datadir):
+    """Check that changes to a loaded table do not affect the next load"""
+    file = datadir / "scenarios_config.csv"
+    scenario_table = load_scenario_table(file)
+    expected = load_scenario_table(file)
+    scenario_table[0]["contamination/contamination_rate/parameters"].append(0)
+    scenario_table.pop()
+    assert load_scenario_table(file) == expected
+
+
+def test_parallel_scenarios_same_as_sequential(datadir):
+    """Check that scenarios in parallel give the same result as sequential ones"""
+    basic_config = load_configuration(datadir / "config.yml")
+    scenario_table = load_scenario_table(datadir / "scenarios_config.csv")[:4]
+    sequential = run_scenarios(
+        config=basic_config,
+        scenario_table=scenario_table,
+        seed=42,
+        num_simulations=2,
+        num_consignments=10,
+    )
+    parallel = run_scenarios(
+        config=basic_config,
+        scenario_table=scenario_table,
+        seed=42,
+        num_simulations=2,
+        num_consignments=10,
+        processes=2,
+    )
+    assert parallel == sequential
@@ -0,0 +1,44 @@
+"""Test recording of success rates"""
+
+import pytest
+
+from popsborder.outputs import SuccessRates
+
+
+class RecordingReporter:
+    """Reporter which keeps names of reported events in a list"""
+
+    def __init__(self):
+        self.events = []
+
+    def true_negative(self):
+        self.events.append("TN")
+
+    def true_positive(self):
+        self.events.append("TP")
+
+    def false_negative(self, consignment):
+        self.events.append(("FN", consignment))
+
+
+def test_success_rates_are_counted_and_reported():
+    """Check counts and events reported for each kind of result"""
+    reporter = RecordingReporter()
+    success_rates = SuccessRates(reporter)
+    consignment = object()
+    success_rates.record_success_rate(True, True, consignment)
+    success_rates.record_success_rate(False, False, consignment)
+    success_rates.record_success_rate(True, False, consignment)
+    success_rates.record_success_rate(True, True, consignment)
+    assert reporter.events == ["TN", "TP", ("FN", consignment), "TN"]
+    assert success_rates.ok == 2
+    assert success_rates.true_negative == 2
+    assert success_rates.true_positive == 1
+    assert success_rates.false_negative == 1
+
+
+def test_success_rates_reject_impossible_result():
+    """Check that finding contaminant in clean consignment is an error"""
+    success_rates = SuccessRates(RecordingReporter())
+    with pytest.raises(RuntimeError):
+        success_rates.record_success_rate(False, True, object())
@@ -10,76 +10,92 @@ from popsborder.outputs import (
 from popsborder.scenarios import run_scenarios, run_simulation
 
 
-NUM_ITEMS_IN_CONFIG = 33
 NUM_ATTRIBUTES_IN_RESULT = 25
 
+CONFIG_COLUMNS = [
+    "consignment/parameter_based/boxes/min",
+    "consignment/parameter_based/boxes/max",
+    "consignment/items_per_box/default",
+    "contamination/contamination_rate/parameters",
+]
+RESULT_COLUMNS = [
+    "missing",
+    "avg_boxes_opened_completion",
+    "avg_boxes_opened_detection",
+]
+
+
+def count_leaves(nested):
+    """Count values in a nested dictionary which are not dictionaries"""
+    return sum(
+        count_leaves(value) if isinstance(value, dict) else 1
+        for value in nested.values()
+    )
+
+
+@pytest.fixture(name="config", scope="module")
+def fixture_config(original_datadir):
+    """Get loaded configuration
 
-@pytest.fixture(name="config")
-def fixture_config(datadir):
-    """Get loaded configuration"""
-    return load_configuration(datadir / "config.yml")
+    The file is only read, so it is taken from the module-scoped original data
+    directory rather than from the per-test copy provided by datadir.
+    """
+    return load_configuration(original_datadir / "config.yml")
 
 
-@pytest.fixture(name="result")
+@pytest.fixture(name="result", scope="module")
 def fixture_executed_simulation_result(config):
-    """Get result of a simulation after running it"""
+    """Get result of a simulation after running it
+
+    The result is shared by tests in this module which only read it.
+    """
     result = run_simulation(
         config=config, seed=42, num_simulations=2, num_consignments=10
     )
     return result
 
 
-def test_simulation_to_pandas_default_columns(result, config):
-    """Check that one result with config coverts with default column values"""
-    df = save_simulation_result_to_pandas(result, config)
-    print(df)
-    shape = df.shape
-    assert len(shape) == 2
-    rows, cols = shape
-    assert cols == NUM_ITEMS_IN_CONFIG + NUM_ATTRIBUTES_IN_RESULT
-    assert rows == 1
-
-
-def test_simulation_to_pandas_no_config(result):
-    """Check that one result without config coverts"""
-    df = save_simulation_result_to_pandas(result)
-    shape = df.shape
-    assert len(shape) == 2
-    rows, cols = shape
-    assert cols == NUM_ATTRIBUTES_IN_RESULT
-    assert rows == 1
-
-
-def test_simulation_to_pandas_no_config_columns(result, config):
-    """Check that result coverts with no config column if columns is an empty list"""
-    df = save_simulation_result_to_pandas(result, config, config_columns=[])
+@pytest.mark.parametrize(
+    ["with_config", "config_columns", "all_config_items"],
+    [
+        # All items in the config are included by default.
+        (True, None, True),
+        # Without config, there are no config columns.
+        (False, None, False),
+        # An empty list is an explicit request for no config columns.
+        (True, [], False),
+    ],
+    ids=["default_columns", "no_config", "no_config_columns"],
+)
+def test_simulation_to_pandas(
+    result, config, with_config, config_columns, all_config_items
+):
+    """Check that one result converts with or without config columns"""
+    # Each leaf of the nested config, including lists, is one column.
+    num_config_columns = count_leaves(config) if all_config_items else 0
+    df = save_simulation_result_to_pandas(
+        result, config if with_config else None, config_columns=config_columns
+    )
     shape = df.shape
     assert len(shape) == 2
     rows, cols = shape
-    assert cols == NUM_ATTRIBUTES_IN_RESULT
+    assert cols == num_config_columns + NUM_ATTRIBUTES_IN_RESULT
     assert rows == 1
+    if num_config_columns:
+        # Nested config items are in key/subkey columns.
+        assert set(CONFIG_COLUMNS) <= set(df.columns)
+    assert set(RESULT_COLUMNS) <= set(df.columns)
 
 
 def test_simulation(result, config):
     """Result converts to data frame with specified columns"""
-    config_columns = [
-        "consignment/parameter_based/boxes/min",
-        "consignment/parameter_based/boxes/max",
-        "consignment/items_per_box/default",
-        "contamination/contamination_rate/parameters",
-    ]
-    result_columns = [
-        "missing",
-        "avg_boxes_opened_completion",
-        "avg_boxes_opened_detection",
-    ]
     df = save_simulation_result_to_pandas(
-        result, config, config_columns=config_columns, result_columns=result_columns
+        result, config, config_columns=CONFIG_COLUMNS, result_columns=RESULT_COLUMNS
     )
     shape = df.shape
     assert len(shape) == 2
     rows, cols = shape
-    assert cols == len(config_columns) + len(result_columns)
+    assert cols == len(CONFIG_COLUMNS) + len(RESULT_COLUMNS)
     assert rows == 1
 
 
@@ -95,24 +111,13 @@ def test_scenarios(datadir):
         num_consignments=10,
     )
     assert len(scenario_table) == len(results)
-    config_columns = [
-        "name",
-        "consignment/parameter_based/boxes/min",
-        "consignment/parameter_based/boxes/max",
-        "consignment/items_per_box/default",
-        "contamination/contamination_rate/parameters",
-    ]
-    result_columns = [
-        "missing",
-        "avg_boxes_opened_completion",
-        "avg_boxes_opened_detection",
-    ]
+    config_columns = ["name"] + CONFIG_COLUMNS
 
     df = save_scenario_result_to_pandas(
-        results, config_columns=config_columns, result_columns=result_columns
+        results, config_columns=config_columns, result_columns=RESULT_COLUMNS
     )
     shape = df.shape
     assert len(shape) == 2
     rows, cols = shape
-    assert cols == len(config_columns) + len(result_columns)
+    assert cols == len(config_columns) + len(RESULT_COLUMNS)
     assert rows == len(scenario_table)